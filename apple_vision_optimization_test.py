@@ -11,28 +11,37 @@ import os
 import sys
 import time
 import json
-import subprocess
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from PIL import Image
 from typing import Dict, List, Tuple, Any
 from itertools import product
+from math import prod
 
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from heic2txt import HEIC2TXT
-from utils.text_utils import calculate_text_similarity, normalize_text_for_comparison
-from utils.image_utils import preprocess_image_for_ocr
+from utils.text_utils import (calculate_text_similarity, calculate_similarity_to_normalized,
+                              normalize_text_for_comparison)
+from utils.image_utils import convert_heic_to_pil, preprocess_image_for_ocr_pil
 from heic2txt_batch import resize_image_if_needed
 
 
 def convert_heic_to_png(heic_path: str, output_path: str) -> bool:
-    """Convert HEIC file to PNG using sips command."""
+    """
+    Convert HEIC file to PNG, decoding in-process instead of forking sips.
+    
+    The PNG is only an intermediate for preprocessing, so it is written with
+    the fastest zlib level.
+    """
     try:
-        result = subprocess.run([
-            'sips', '-s', 'format', 'png', heic_path, '--out', output_path
-        ], capture_output=True, text=True, timeout=30)
-        return result.returncode == 0
+        image = convert_heic_to_pil(heic_path)
+        if image is None:
+            return False
+        image.save(output_path, 'PNG', compress_level=1)
+        return True
     except Exception as e:
         print(f"❌ Error converting HEIC: {e}")
         return False
@@ -48,6 +57,22 @@ def load_ground_truth(ground_truth_path: str) -> str:
         return ""
 
 
+_TEXT_REQUEST = None
+_DEFAULT_LANGUAGES = None
+
+
+def _make_request():
+    """Return the shared VNRecognizeTextRequest, allocating it on first use."""
+    global _TEXT_REQUEST, _DEFAULT_LANGUAGES
+    
+    if _TEXT_REQUEST is None:
+        from Vision import VNRecognizeTextRequest
+        _TEXT_REQUEST = VNRecognizeTextRequest.alloc().init()
+        _DEFAULT_LANGUAGES = list(_TEXT_REQUEST.recognitionLanguages())
+    
+    return _TEXT_REQUEST
+
+
 class OptimizedAppleVisionOCREngine:
     """Apple Vision OCR Engine with configurable parameters."""
     
@@ -58,7 +83,8 @@ class OptimizedAppleVisionOCREngine:
                  custom_words: List[str] = None,
                  automatically_detects_language: bool = False,
                  uses_cpu_only: bool = False,
-                 language: str = "en"):
+                 language: str = "en",
+                 text_request=None):
         """
         Initialize Apple Vision OCR with configurable parameters.
         
@@ -70,55 +96,87 @@ class OptimizedAppleVisionOCREngine:
             automatically_detects_language: Auto-detect language
             uses_cpu_only: Force CPU-only processing
             language: Language code
+            text_request: VNRecognizeTextRequest to reconfigure (defaults to the shared one)
         """
-        self.recognition_level = recognition_level
-        self.uses_language_correction = uses_language_correction
-        self.minimum_text_height = minimum_text_height
-        self.custom_words = custom_words or []
-        self.automatically_detects_language = automatically_detects_language
-        self.uses_cpu_only = uses_cpu_only
-        self.language = language
+        self.text_request = text_request if text_request is not None else _make_request()
+        
+        # Nothing has been applied to the request yet
+        self.recognition_level = None
+        self.uses_language_correction = None
+        self.minimum_text_height = None
+        self.custom_words = None
+        self.automatically_detects_language = None
+        self.uses_cpu_only = None
+        self.language = None
         
-        # Import Vision framework
-        from Vision import VNRecognizeTextRequest, VNImageRequestHandler
-        from Foundation import NSURL
+        self.configure(
+            recognition_level=recognition_level,
+            uses_language_correction=uses_language_correction,
+            minimum_text_height=minimum_text_height,
+            custom_words=custom_words,
+            automatically_detects_language=automatically_detects_language,
+            uses_cpu_only=uses_cpu_only,
+            language=language,
+        )
+    
+    def configure(self,
+                  recognition_level: int = 1,
+                  uses_language_correction: bool = True,
+                  minimum_text_height: float = 0.0,
+                  custom_words: List[str] = None,
+                  automatically_detects_language: bool = False,
+                  uses_cpu_only: bool = False,
+                  language: str = "en") -> None:
+        """
+        Reconfigure the text request, only touching settings that changed.
         
-        # Configure the text recognition request
-        self.text_request = VNRecognizeTextRequest.alloc().init()
-        self.text_request.setRecognitionLevel_(recognition_level)
-        self.text_request.setUsesLanguageCorrection_(uses_language_correction)
-        self.text_request.setMinimumTextHeight_(minimum_text_height)
-        self.text_request.setAutomaticallyDetectsLanguage_(automatically_detects_language)
-        self.text_request.setUsesCPUOnly_(uses_cpu_only)
+        Args:
+            Same as __init__ (except text_request)
+        """
+        custom_words = custom_words or []
         
-        # Set custom words if provided
-        if custom_words:
+        if recognition_level != self.recognition_level:
+            self.text_request.setRecognitionLevel_(recognition_level)
+        if uses_language_correction != self.uses_language_correction:
+            self.text_request.setUsesLanguageCorrection_(uses_language_correction)
+        if minimum_text_height != self.minimum_text_height:
+            self.text_request.setMinimumTextHeight_(minimum_text_height)
+        if automatically_detects_language != self.automatically_detects_language:
+            self.text_request.setAutomaticallyDetectsLanguage_(automatically_detects_language)
+        if uses_cpu_only != self.uses_cpu_only:
+            self.text_request.setUsesCPUOnly_(uses_cpu_only)
+        if custom_words != self.custom_words:
             self.text_request.setCustomWords_(custom_words)
         
-        # Set language if not auto-detecting
-        if not automatically_detects_language and language != "en":
+        # Set language if not auto-detecting, otherwise restore the default
+        if (automatically_detects_language, language) != (self.automatically_detects_language, self.language):
+            languages = _DEFAULT_LANGUAGES or ["en-US"]
+            if not automatically_detects_language and language != "en":
+                languages = [language]
             try:
-                self.text_request.setRecognitionLanguages_([language])
+                self.text_request.setRecognitionLanguages_(languages)
             except Exception as e:
                 print(f"⚠️  Warning: Could not set language to {language}: {e}")
+        
+        self.recognition_level = recognition_level
+        self.uses_language_correction = uses_language_correction
+        self.minimum_text_height = minimum_text_height
+        self.custom_words = custom_words
+        self.automatically_detects_language = automatically_detects_language
+        self.uses_cpu_only = uses_cpu_only
+        self.language = language
     
     def extract_text(self, image: Image.Image) -> str:
         """Extract text from image using configured parameters."""
-        import tempfile
         from Vision import VNImageRequestHandler
-        from Foundation import NSURL
+        from ocr_engines.apple_vision_ocr import pil_to_cgimage
         
         try:
-            # Convert PIL image to temporary file
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp_file:
-                image.save(temp_file.name, 'PNG')
-                temp_path = temp_file.name
-            
-            # Create NSURL from file path
-            file_url = NSURL.fileURLWithPath_(temp_path)
+            # Hand the pixels to Vision directly instead of a temporary PNG
+            cg_image = pil_to_cgimage(image)
             
             # Create image request handler
-            request_handler = VNImageRequestHandler.alloc().initWithURL_options_(file_url, None)
+            request_handler = VNImageRequestHandler.alloc().initWithCGImage_options_(cg_image, None)
             
             # Perform text recognition
             error = None
@@ -142,9 +200,6 @@ class OptimizedAppleVisionOCREngine:
                         if hasattr(candidate, 'string'):
                             extracted_text += candidate.string() + "\n"
             
-            # Clean up temporary file
-            os.unlink(temp_path)
-            
             return extracted_text.strip()
             
         except Exception as e:
@@ -152,24 +207,66 @@ class OptimizedAppleVisionOCREngine:
             return ""
 
 
-def test_parameter_combination(params: Dict, image: Image.Image, ground_truth: str) -> Dict:
-    """Test a specific parameter combination."""
+def canonical_params(params: Dict) -> Tuple:
+    """
+    Build a hashable key for parameters, dropping settings Vision ignores.
+    
+    The language is irrelevant while automatic language detection is on,
+    and no custom words behaves the same whether given as None or [].
+    """
+    canonical = dict(params)
+    canonical['custom_words'] = tuple(canonical.get('custom_words') or ())
+    if canonical.get('automatically_detects_language'):
+        canonical.pop('language', None)
+    return tuple(sorted(canonical.items()))
+
+
+def test_parameter_combination(params: Dict, image: Image.Image, ground_truth: str,
+                               engine: OptimizedAppleVisionOCREngine,
+                               cache: Dict = None, image_hash: str = None,
+                               gt_normalized: str = None) -> Dict:
+    """
+    Test a specific parameter combination on a shared engine.
+    
+    If a cache dict and image hash are given, OCR output is looked up by
+    (image_hash, canonical parameters) so equivalent combinations only hit
+    Vision once. Passing gt_normalized (the ground truth already run through
+    normalize_text_for_comparison) skips re-normalizing it on every call.
+    """
     print(f"\n🔬 Testing: {params}")
     
     start_time = time.time()
     
     try:
-        # Create engine with these parameters
-        engine = OptimizedAppleVisionOCREngine(**params)
+        cache_key = (image_hash, canonical_params(params)) if cache is not None else None
+        cached = cache_key is not None and cache_key in cache
         
-        # Extract text
-        text = engine.extract_text(image)
+        if cached:
+            # Reuse the text and OCR time of the equivalent combination
+            text, ocr_time = cache[cache_key]
+        else:
+            # Reconfigure the shared request for these parameters
+            engine.configure(**params)
+            
+            # Extract text
+            text = engine.extract_text(image)
+            ocr_time = time.time() - start_time
+            
+            if cache_key is not None:
+                cache[cache_key] = (text, ocr_time)
         
         # Calculate similarity
-        similarity = calculate_text_similarity(ground_truth, text) if text else 0.0
+        if not text:
+            similarity = 0.0
+        elif gt_normalized is not None:
+            similarity = calculate_similarity_to_normalized(gt_normalized, text)
+        else:
+            similarity = calculate_text_similarity(ground_truth, text)
         
-        # Calculate time
+        # Calculate time (a cache hit still reports the OCR time it stands in for)
         total_time = time.time() - start_time
+        if cached:
+            total_time += ocr_time
         
         result = {
             **params,
@@ -177,9 +274,12 @@ def test_parameter_combination(params: Dict, image: Image.Image, ground_truth: s
             'similarity': similarity,
             'time': total_time,
             'success': len(text) > 0,
+            'cached': cached,
             'extracted_text': text[:100] + "..." if len(text) > 100 else text
         }
         
+        if cached:
+            print("   ♻️  Reused OCR result of an equivalent combination")
         print(f"   📊 Similarity: {similarity:.2f}%")
         print(f"   ⏱️  Time: {total_time:.3f}s")
         print(f"   📝 Text: {text[:50]}..." if text else "   📝 Text: (none)")
@@ -198,8 +298,87 @@ def test_parameter_combination(params: Dict, image: Image.Image, ground_truth: s
         }
 
 
-def main():
-    """Main optimization function."""
+def should_skip(params: Dict) -> bool:
+    """
+    Check whether a full-grid combination duplicates another one.
+    
+    While automatic language detection is on the language setting is
+    ignored, so only the 'en' variant of those combinations is run.
+    """
+    return bool(params.get('automatically_detects_language')) and params.get('language') != 'en'
+
+
+_WORKER = {}
+
+
+def _init_worker(image_bytes: bytes, image_mode: str, image_size: Tuple[int, int],
+                 ground_truth: str) -> None:
+    """Rebuild the sweep image and a per-process engine in a pool worker."""
+    _WORKER['image'] = Image.frombytes(image_mode, image_size, image_bytes)
+    _WORKER['ground_truth'] = ground_truth
+    _WORKER['gt_normalized'] = normalize_text_for_comparison(ground_truth)
+    _WORKER['engine'] = OptimizedAppleVisionOCREngine()
+
+
+def _test_in_worker(params: Dict) -> Dict:
+    """Test one combination against the worker's image and engine."""
+    return test_parameter_combination(params, _WORKER['image'], _WORKER['ground_truth'], _WORKER['engine'],
+                                      gt_normalized=_WORKER['gt_normalized'])
+
+
+def run_combinations_parallel(combinations, image: Image.Image, ground_truth: str,
+                              image_hash: str, workers: int):
+    """
+    Test parameter combinations on a process pool.
+    
+    The image is shipped to each worker once as raw bytes. Equivalent
+    combinations (same canonical parameters) are only submitted once, and
+    results are yielded in the order the combinations were given.
+    """
+    initargs = (image.tobytes(), image.mode, image.size, ground_truth)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as executor:
+        futures = {}
+        scheduled = []
+        for params in combinations:
+            key = (image_hash, canonical_params(params))
+            cached = key in futures
+            if not cached:
+                futures[key] = executor.submit(_test_in_worker, params)
+            scheduled.append((params, futures[key], cached))
+        
+        for params, future, cached in scheduled:
+            result = future.result()
+            if cached:
+                result = {**result, **params, 'cached': True}
+            yield result
+
+
+def screening_combinations(parameter_ranges: Dict[str, List], baseline: Dict[str, Any]):
+    """
+    Yield a one-factor-at-a-time screening schedule.
+    
+    The baseline comes first, followed by the baseline with a single
+    parameter changed to each of its other values. This is enough for the
+    per-parameter averages in the analysis without running every interaction.
+    """
+    yield dict(baseline)
+    for param_name, values in parameter_ranges.items():
+        for value in values:
+            if value != baseline[param_name]:
+                yield {**baseline, param_name: value}
+
+
+def main(full_grid: bool = False, workers: int = None):
+    """
+    Main optimization function.
+    
+    Args:
+        full_grid: Test the full Cartesian product instead of the screening schedule
+        workers: Number of worker processes (default: half the CPU count, 1 = serial)
+    """
+    if workers is None:
+        workers = max(1, (os.cpu_count() or 2) // 2)
+    
     print("🔬 Apple Vision OCR Parameter Optimization Test")
     print("=" * 60)
     
@@ -226,13 +405,17 @@ def main():
         return
     
     print(f"📄 Ground truth: '{ground_truth}' ({len(ground_truth)} chars)")
+    gt_normalized = normalize_text_for_comparison(ground_truth)
     
     # Prepare image with preprocessing (since it worked best)
     print("\n🔄 Applying preprocessing...")
-    preprocessed_path = preprocess_image_for_ocr(png_path, "/tmp", save_images=True)
-    image = Image.open(preprocessed_path)
+    image = preprocess_image_for_ocr_pil(Image.open(png_path))
     print(f"🖼️  Preprocessed image size: {image.size}")
     
+    # Key OCR results on the image content so equivalent combinations are reused
+    image_hash = hashlib.sha1(image.tobytes()).hexdigest()
+    ocr_cache = {}
+    
     # Define parameter ranges to test
     parameter_ranges = {
         'recognition_level': [0, 1],  # Fast vs Accurate
@@ -244,30 +427,65 @@ def main():
         'language': ['en', 'en_US']
     }
     
-    # Generate all combinations
+    # Defaults the screening schedule perturbs one parameter at a time
+    baseline = {
+        'recognition_level': 1,
+        'uses_language_correction': True,
+        'minimum_text_height': 0.0,
+        'automatically_detects_language': False,
+        'uses_cpu_only': False,
+        'custom_words': None,
+        'language': 'en'
+    }
+    
+    # Generate combinations
     param_names = list(parameter_ranges.keys())
     param_values = list(parameter_ranges.values())
     
-    print(f"\n🧪 Testing {len(list(product(*param_values)))} parameter combinations...")
+    if full_grid:
+        def grid():
+            return (dict(zip(param_names, combination)) for combination in product(*param_values))
+        
+        skipped = sum(1 for params in grid() if should_skip(params))
+        combinations = (params for params in grid() if not should_skip(params))
+        total = prod(len(values) for values in param_values) - skipped
+        print(f"\n⏭️  Skipping {skipped} combinations equivalent to another in the grid")
+    else:
+        combinations = screening_combinations(parameter_ranges, baseline)
+        total = 1 + sum(len(values) - 1 for values in param_values)
+    
+    print(f"\n🧪 Testing {total} parameter combinations...")
     
     results = []
     best_similarity = 0.0
     best_params = None
     
-    # Test each combination
-    for i, combination in enumerate(product(*param_values)):
-        params = dict(zip(param_names, combination))
-        
-        print(f"\n--- Test {i+1}/{len(list(product(*param_values)))} ---")
-        
-        result = test_parameter_combination(params, image, ground_truth)
-        results.append(result)
-        
-        # Track best result
-        if result['similarity'] > best_similarity:
-            best_similarity = result['similarity']
-            best_params = params.copy()
-            print(f"   🏆 NEW BEST: {best_similarity:.2f}%")
+    if workers > 1:
+        print(f"🧵 Running on {workers} worker processes")
+        outcomes = run_combinations_parallel(combinations, image, ground_truth, image_hash, workers)
+    else:
+        # One engine (and one VNRecognizeTextRequest) for the whole sweep
+        engine = OptimizedAppleVisionOCREngine()
+        outcomes = (test_parameter_combination(params, image, ground_truth, engine,
+                                               cache=ocr_cache, image_hash=image_hash,
+                                               gt_normalized=gt_normalized)
+                    for params in combinations)
+    
+    # Stream detailed results as JSON lines so a crashed sweep keeps what it finished
+    results_file = "apple_vision_optimization_results.jsonl"
+    with open(results_file, 'w') as results_out:
+        # Collect each combination's result
+        for i, result in enumerate(outcomes):
+            print(f"\n--- Completed {i+1}/{total} ---")
+            results.append(result)
+            results_out.write(json.dumps(result) + "\n")
+            results_out.flush()
+            
+            # Track best result
+            if result['similarity'] > best_similarity:
+                best_similarity = result['similarity']
+                best_params = {name: result[name] for name in param_names}
+                print(f"   🏆 NEW BEST: {best_similarity:.2f}%")
     
     # Print summary
     print("\n" + "=" * 80)
@@ -284,7 +502,7 @@ def main():
     for i, result in enumerate(results[:10]):
         status = "✅" if result['success'] else "❌"
         params_str = ", ".join([f"{k}={v}" for k, v in result.items() 
-                               if k not in ['similarity', 'time', 'success', 'text_length', 'extracted_text', 'error']])
+                               if k not in ['similarity', 'time', 'success', 'text_length', 'extracted_text', 'error', 'cached']])
         print(f"{i+1:<4} {result['similarity']:<10.2f} {result['time']:<8.3f} {status:<8} {params_str}")
     
     # Best overall result
@@ -318,20 +536,23 @@ def main():
             avg_similarity = sum(similarities) / len(similarities)
             print(f"     {value}: {avg_similarity:.2f}% (n={len(similarities)})")
     
-    # Save detailed results
-    results_file = "apple_vision_optimization_results.json"
-    with open(results_file, 'w') as f:
-        json.dump(results, f, indent=2)
     print(f"\n💾 Detailed results saved to: {results_file}")
     
     # Cleanup
     try:
         os.unlink(png_path)
-        if png_path != preprocessed_path:
-            os.unlink(preprocessed_path)
-    except:
+    except OSError:
         pass
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Apple Vision OCR parameter optimization')
+    parser.add_argument('--full-grid', action='store_true',
+                        help='Test every parameter combination instead of the one-factor-at-a-time screen')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='Number of worker processes (default: half the CPU count, 1 = serial)')
+    args = parser.parse_args()
+    
+    main(full_grid=args.full_grid, workers=args.workers)
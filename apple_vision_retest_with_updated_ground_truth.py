@@ -21,7 +21,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from heic2txt import HEIC2TXT
 from utils.text_utils import calculate_text_similarity, normalize_text_for_comparison
-from utils.image_utils import preprocess_image_for_ocr
+from utils.image_utils import preprocess_image_for_ocr_pil
 
 
 def convert_heic_to_png(heic_path: str, output_path: str) -> bool:
@@ -103,8 +103,7 @@ def test_apple_vision_orientation(engine_name: str, image_path: str, orientation
         if use_preprocessing:
             # Apply preprocessing
             print("   🔄 Applying preprocessing...")
-            preprocessed_path = preprocess_image_for_ocr(image_path, "/tmp", save_images=True)
-            image = Image.open(preprocessed_path)
+            image = preprocess_image_for_ocr_pil(image)
             print(f"   📏 Preprocessed image size: {image.size}")
         else:
             print("   ⏭️  Skipping preprocessing")
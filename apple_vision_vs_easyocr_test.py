@@ -7,27 +7,74 @@ Uses the same methodology as EasyOCR optimization testing.
 import os
 import sys
 import time
+import hashlib
 import json
 from pathlib import Path
-from PIL import Image
-import difflib
+
+try:
+    import orjson
+except ImportError:  # Fall back to json below
+    orjson = None
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from heic2txt import HEIC2TXT
-from utils.text_utils import calculate_text_similarity
+from ocr_engines.apple_vision_ocr import AppleVisionOCREngine
+from ocr_engines.easyocr_engine import EasyOCREngine
+from utils.image_utils import convert_heic_to_pil, preprocess_image_for_ocr_pil
+from utils.text_utils import calculate_text_similarity, cer, save_text_to_file, wer
 
-def test_ocr_engine(engine_name, image_path, ground_truth_path, language="en", preprocessing=False):
+def prepare_test_image(image, preprocessing=False):
+    """
+    Resize (and optionally preprocess) the decoded test image.
+    
+    Args:
+        image: Decoded test image (PIL Image)
+        preprocessing: Whether to apply preprocessing after resizing
+        
+    Returns:
+        PIL Image ready for OCR
+    """
+    # First, resize image if needed (always apply this step)
+    from heic2txt_batch import resize_pil_image_if_needed
+    image = resize_pil_image_if_needed(image, max_size=4000)
+    
+    # Apply additional preprocessing if requested
+    if preprocessing:
+        image = preprocess_image_for_ocr_pil(image)
+    
+    return image
+
+def create_engine(engine_name, language="en"):
+    """
+    Create an OCR engine directly, without the HEIC2TXT wrapper.
+    
+    Args:
+        engine_name: Name of the OCR engine ('easyocr' or 'apple_vision')
+        language: Language code for OCR
+        
+    Returns:
+        OCR engine instance
+    """
+    engine_classes = {
+        'apple_vision': AppleVisionOCREngine,
+        'easyocr': EasyOCREngine,
+    }
+    return engine_classes[engine_name](language=language)
+
+def test_ocr_engine(engine_name, prepared_image, ground_truth_path, language="en", preprocessing=False,
+                    engine=None, init_time=0.0):
     """
     Test a specific OCR engine with the given image and ground truth.
     
     Args:
         engine_name: Name of the OCR engine ('easyocr' or 'apple_vision')
-        image_path: Path to the test image
+        prepared_image: Image already resized/preprocessed by prepare_test_image
         ground_truth_path: Path to the ground truth text file
         language: Language code for OCR
-        preprocessing: Whether to apply preprocessing
+        preprocessing: Whether prepared_image is the preprocessed variant (for reporting)
+        engine: Already created engine to reuse (created here if None)
+        init_time: Time it took to create engine, for reporting
         
     Returns:
         dict: Test results including similarity, time, and extracted text
@@ -38,38 +85,17 @@ def test_ocr_engine(engine_name, image_path, ground_truth_path, language="en", p
     
     try:
         # Initialize OCR engine
-        start_time = time.time()
-        heic2txt = HEIC2TXT(engine=engine_name, language=language)
-        init_time = time.time() - start_time
+        if engine is None:
+            start_time = time.perf_counter_ns()
+            engine = create_engine(engine_name, language)
+            init_time = (time.perf_counter_ns() - start_time) / 1e9
         
         print(f"✅ {engine_name.upper()} initialized in {init_time:.2f}s")
         
-        # Load and process image
-        start_time = time.time()
-        
-        # First, resize image if needed (always apply this step)
-        from heic2txt_batch import resize_image_if_needed
-        resized_image_path = resize_image_if_needed(image_path, max_size=4000)
-        
-        # Load the (potentially resized) image
-        image = Image.open(resized_image_path)
-        
-        # Apply additional preprocessing if requested
-        if preprocessing:
-            from utils.image_utils import preprocess_image_for_ocr
-            import tempfile
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp_file:
-                temp_path = tmp_file.name
-            image.save(temp_path)
-            preprocessed_path = preprocess_image_for_ocr(temp_path, os.path.dirname(temp_path), False)
-            image = Image.open(preprocessed_path)
-            os.unlink(temp_path)
-            if preprocessed_path != temp_path:
-                os.unlink(preprocessed_path)
-        
         # Extract text
-        extracted_text = heic2txt.ocr.extract_text(image)
-        extraction_time = time.time() - start_time
+        start_time = time.perf_counter_ns()
+        extracted_text = engine.extract_text(prepared_image)
+        extraction_time = (time.perf_counter_ns() - start_time) / 1e9
         
         print(f"✅ Text extracted in {extraction_time:.2f}s")
         print(f"📝 Extracted text length: {len(extracted_text)} characters")
@@ -80,14 +106,19 @@ def test_ocr_engine(engine_name, image_path, ground_truth_path, language="en", p
         
         # Calculate similarity
         similarity = calculate_text_similarity(extracted_text, ground_truth)
+        char_error_rate = cer(ground_truth, extracted_text)
+        word_error_rate = wer(ground_truth, extracted_text)
         
         print(f"📊 Similarity: {similarity:.2f}%")
+        print(f"📊 CER: {char_error_rate:.2%}, WER: {word_error_rate:.2%}")
         print(f"⏱️  Total time: {init_time + extraction_time:.2f}s")
         
         return {
             'engine': engine_name,
             'preprocessing': preprocessing,
             'similarity': similarity,
+            'cer': char_error_rate,
+            'wer': word_error_rate,
             'init_time': init_time,
             'extraction_time': extraction_time,
             'total_time': init_time + extraction_time,
@@ -102,6 +133,8 @@ def test_ocr_engine(engine_name, image_path, ground_truth_path, language="en", p
             'engine': engine_name,
             'preprocessing': preprocessing,
             'similarity': 0.0,
+            'cer': 1.0,
+            'wer': 1.0,
             'init_time': 0.0,
             'extraction_time': 0.0,
             'total_time': 0.0,
@@ -134,22 +167,13 @@ def run_comprehensive_test():
         print(f"❌ Ground truth not found: {ground_truth}")
         return
     
-    # Convert HEIC to PNG for testing
-    print("\n🔄 Converting HEIC to PNG...")
-    png_path = test_image.replace('.HEIC', '_test.png')
-    
-    try:
-        # Use sips to convert HEIC to PNG
-        import subprocess
-        result = subprocess.run(['sips', '-s', 'format', 'png', test_image, '--out', png_path], 
-                              capture_output=True, text=True)
-        if result.returncode != 0:
-            print(f"❌ Failed to convert HEIC: {result.stderr}")
-            return
-        print(f"✅ Converted to: {png_path}")
-    except Exception as e:
-        print(f"❌ Error converting HEIC: {str(e)}")
+    # Decode HEIC in memory for testing
+    print("\n🔄 Decoding HEIC...")
+    image = convert_heic_to_pil(test_image, max_size=4000)
+    if image is None:
+        print(f"❌ Failed to decode HEIC: {test_image}")
         return
+    print(f"✅ Decoded image: {image.size[0]}x{image.size[1]}")
     
     # Test configurations
     test_configs = [
@@ -159,25 +183,43 @@ def run_comprehensive_test():
         {'engine': 'apple_vision', 'preprocessing': True},
     ]
     
+    # Resize and preprocess once; the engines only differ in the OCR step
+    print("\n🔄 Preparing test images...")
+    resized_image = prepare_test_image(image)
+    prepared_images = {
+        False: resized_image,
+        True: prepare_test_image(resized_image, preprocessing=True),
+    }
+    
     results = []
     
+    # Create each engine once and reuse it for both preprocessing variants
+    engines = {}
+    
     # Run all tests
     for config in test_configs:
+        engine_name = config['engine']
+        if engine_name not in engines:
+            start_time = time.perf_counter_ns()
+            try:
+                engine = create_engine(engine_name, language)
+            except Exception as e:
+                print(f"❌ Error initializing {engine_name}: {str(e)}")
+                engine = None
+            engines[engine_name] = (engine, (time.perf_counter_ns() - start_time) / 1e9)
+        engine, init_time = engines[engine_name]
+        
         result = test_ocr_engine(
-            engine_name=config['engine'],
-            image_path=png_path,
+            engine_name=engine_name,
+            prepared_image=prepared_images[config['preprocessing']],
             ground_truth_path=ground_truth,
             language=language,
-            preprocessing=config['preprocessing']
+            preprocessing=config['preprocessing'],
+            engine=engine,
+            init_time=init_time
         )
         results.append(result)
     
-    # Clean up test PNG
-    try:
-        os.unlink(png_path)
-    except:
-        pass
-    
     # Display results summary
     print(f"\n{'='*80}")
     print("📊 TEST RESULTS SUMMARY")
@@ -250,10 +292,26 @@ def run_comprehensive_test():
                 else:
                     print(f"   🤝 Both engines have equal accuracy")
     
-    # Save detailed results
+    # Save detailed results, with the extracted texts in sidecar files
     results_file = "apple_vision_vs_easyocr_results.json"
-    with open(results_file, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    saved_results = []
+    for result in results:
+        saved = {key: value for key, value in result.items() if key != 'extracted_text'}
+        text = result['extracted_text']
+        if text:
+            suffix = "prep" if result['preprocessing'] else "no_prep"
+            text_file = f"apple_vision_vs_easyocr_{result['engine']}_{suffix}.txt"
+            save_text_to_file(text, text_file)
+            saved['text_file'] = text_file
+            saved['text_sha1'] = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        saved_results.append(saved)
+    
+    if orjson is not None:
+        with open(results_file, 'wb') as f:
+            f.write(orjson.dumps(saved_results, option=orjson.OPT_INDENT_2))
+    else:
+        with open(results_file, 'w', encoding='utf-8') as f:
+            json.dump(saved_results, f, indent=2, ensure_ascii=False)
     
     print(f"\n💾 Detailed results saved to: {results_file}")
     
@@ -6,65 +6,113 @@ This script demonstrates how to process multiple images with domain-specific
 custom words to improve OCR accuracy.
 """
 
+import argparse
+import asyncio
 import os
+import queue
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict
-from ocr_engines.apple_vision_ocr import AppleVisionOCREngine
-from utils.image_utils import convert_heic_to_pil, preprocess_image_for_ocr
-from utils.text_utils import save_text_to_file
+from typing import Callable, Iterable, Iterator, List, Dict
+from ocr_engines.apple_vision_ocr import AppleVisionOCREngine, get_engine
+from utils.image_utils import convert_heic_to_pil, preprocess_image_for_ocr_pil
+from utils.custom_word_lists import get_terraform_custom_words
+from utils.text_utils import find_words_in_tokens, save_text_to_file
 
-def get_terraform_custom_words() -> List[str]:
-    """Get custom words optimized for Terraform/infrastructure content."""
-    return [
-        # Terraform core terms
-        "terraform", "provider", "resource", "variable", "output", "module",
-        "data", "locals", "for_each", "count", "depends_on", "lifecycle",
-        "backend", "state", "workspace", "environment", "configuration",
-        
-        # AWS services and resources
-        "aws", "ec2", "s3", "rds", "lambda", "apigateway", "cloudfront",
-        "cloudwatch", "iam", "kms", "secrets", "ssm", "parameter", "store",
-        "vpc", "subnet", "security_group", "route_table", "internet_gateway",
-        "nat_gateway", "load_balancer", "autoscaling", "elasticache",
-        "redshift", "dynamodb", "sqs", "sns", "eventbridge", "stepfunctions",
-        "ecs", "eks", "fargate", "ecr", "codebuild", "codepipeline",
-        "codedeploy", "cloudformation", "systems_manager", "config",
-        
-        # File extensions and formats
-        "tf", "tfvars", "tfstate", "hcl", "json", "yaml", "yml", "toml",
-        
-        # Common technical terms
-        "infrastructure", "deployment", "production", "staging", "development",
-        "monitoring", "logging", "metrics", "alerting", "backup", "recovery",
-        "scalability", "availability", "reliability", "performance",
-        "security", "compliance", "governance", "policy", "access",
-        "authentication", "authorization", "encryption", "decryption",
-        "network", "firewall", "bastion", "nat", "vpn", "directconnect"
-    ]
+# Images per extract_text_batch() call in the pool backends
+BATCH_SIZE = 32
+
+# Per-worker state, filled in by _init_worker (thread-local so each thread
+# of the thread backend gets its own engine)
+_WORKER = threading.local()
 
-def process_image_with_custom_words(image_path: str, custom_words: List[str], 
-                                  output_dir: str) -> Dict:
-    """Process a single image with custom words."""
+def _init_worker(custom_words: List[str], backend: str) -> None:
+    """Build the OCR engine once per worker instead of once per image."""
+    if backend == "thread":
+        # Threads must not share a VNRecognizeTextRequest
+        _WORKER.ocr = AppleVisionOCREngine(language="en", custom_words=custom_words)
+        _WORKER.ocr.prewarm()
+    else:
+        _WORKER.ocr = get_engine(custom_words)
+
+def _prefetch(items: Iterable, size: int = 2) -> Iterator:
+    """
+    Iterate over items while a background thread runs up to size items ahead.
     
-    print(f"📷 Processing: {os.path.basename(image_path)}")
+    Args:
+        items: Iterable whose items are expensive to produce (e.g. decoding)
+        size: Maximum number of items produced ahead of the consumer
+        
+    Returns:
+        Iterator over the same items, in order
+    """
+    buffer = queue.Queue(maxsize=size)
+    done = object()
+    errors = []
     
-    # Convert HEIC to PIL Image
-    image = convert_heic_to_pil(image_path)
-    if image is None:
-        return {"success": False, "error": "Could not convert HEIC image"}
+    def fill():
+        try:
+            for item in items:
+                buffer.put(item)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            buffer.put(done)
     
-    # Preprocess image
-    preprocessed_image = preprocess_image_for_ocr(image)
+    threading.Thread(target=fill, daemon=True).start()
     
-    # Initialize OCR with custom words
-    ocr = AppleVisionOCREngine(language="en", custom_words=custom_words)
+    while (item := buffer.get()) is not done:
+        yield item
+    if errors:
+        raise errors[0]
+
+def _process_chunk_in_worker(image_paths: List[str], output_dir: str) -> List[Dict]:
+    """Process a chunk of images with one extract_text_batch() call."""
+    results = {}
+    decoded_paths = []
+    wait_time = 0.0
     
-    # Extract text
-    start_time = time.time()
-    text = ocr.extract_text(preprocessed_image)
-    processing_time = time.time() - start_time
+    def decoded():
+        for image_path in image_paths:
+            print(f"📷 Processing: {os.path.basename(image_path)}")
+            image = convert_heic_to_pil(image_path)
+            if image is not None:
+                image = preprocess_image_for_ocr_pil(image)
+            yield image_path, image
     
+    def images():
+        # The next images are decoded in the background while one is OCR'd;
+        # only the prefetch buffer is held in memory, never the whole chunk
+        nonlocal wait_time
+        prefetched = _prefetch(decoded())
+        while True:
+            start_time = time.perf_counter_ns()
+            item = next(prefetched, None)
+            wait_time += (time.perf_counter_ns() - start_time) / 1e9
+            if item is None:
+                return
+            
+            image_path, image = item
+            if image is None:
+                results[image_path] = {"success": False, "error": "Could not convert HEIC image"}
+                continue
+            decoded_paths.append(image_path)
+            yield image
+    
+    start_time = time.perf_counter_ns()
+    texts = _WORKER.ocr.extract_text_batch(images())
+    processing_time = ((time.perf_counter_ns() - start_time) / 1e9 - wait_time) / max(len(texts), 1)
+    
+    for image_path, text in zip(decoded_paths, texts):
+        results[image_path] = save_ocr_result(image_path, text, processing_time,
+                                              _WORKER.ocr, output_dir)
+    
+    return [results[image_path] for image_path in image_paths]
+
+def save_ocr_result(image_path: str, text: str, processing_time: float,
+                    ocr: AppleVisionOCREngine, output_dir: str) -> Dict:
+    """Save the text extracted from one image and count the custom words in it."""
     if not text.strip():
         return {"success": False, "error": "No text detected"}
     
@@ -76,10 +124,7 @@ def process_image_with_custom_words(image_path: str, custom_words: List[str],
         return {"success": False, "error": "Could not save text file"}
     
     # Count custom words found
-    words_found = []
-    for word in custom_words:
-        if word.lower() in text.lower():
-            words_found.append(word)
+    words_found = find_words_in_tokens(ocr.custom_words, ocr.words_lower, text)
     
     return {
         "success": True,
@@ -89,15 +134,109 @@ def process_image_with_custom_words(image_path: str, custom_words: List[str],
         "output_file": str(output_file)
     }
 
+async def pipeline_process_with_custom_words(heic_files: List[Path], output_dir: str,
+                                             custom_words: List[str], workers: int,
+                                             on_result: Callable[[Path, Dict], None]) -> None:
+    """
+    Run decode, preprocessing and OCR as three overlapping stages.
+    
+    Each stage runs its blocking work in the event loop's default thread
+    pool and hands images on through a bounded queue, so one file is decoded while
+    the previous one is preprocessed and the one before that is OCR'd.
+    
+    Args:
+        heic_files: HEIC files to process
+        output_dir: Directory to save text files
+        custom_words: Custom words for Apple Vision
+        workers: Concurrent decodes and preprocessing tasks
+        on_result: Called with (heic_file, result) as each file finishes
+    """
+    ocr = get_engine(custom_words)
+    loop = asyncio.get_running_loop()
+    
+    # Bounded queues and the semaphore cap how many decoded images are in memory
+    decoded = asyncio.Queue(maxsize=workers)
+    preprocessed = asyncio.Queue(maxsize=workers)
+    decode_slots = asyncio.Semaphore(workers)
+    
+    async def decode(heic_file: Path) -> None:
+        # Hold the slot until the image is queued, so at most `workers`
+        # decoded images wait outside the queue
+        async with decode_slots:
+            image = await loop.run_in_executor(None, convert_heic_to_pil, str(heic_file))
+            error = "Could not convert HEIC image" if image is None else None
+            await decoded.put((heic_file, image, error))
+    
+    async def decode_all() -> None:
+        await asyncio.gather(*(decode(heic_file) for heic_file in heic_files))
+        for _ in range(workers):
+            await decoded.put(None)
+    
+    async def preprocess_worker() -> None:
+        while (item := await decoded.get()) is not None:
+            heic_file, image, error = item
+            if error is None:
+                try:
+                    image = await loop.run_in_executor(None, preprocess_image_for_ocr_pil, image)
+                except Exception as e:
+                    error = str(e)
+            await preprocessed.put((heic_file, image, error))
+        await preprocessed.put(None)
+    
+    async def ocr_worker() -> None:
+        # One consumer: the shared engine's request must not run concurrently
+        remaining = workers
+        while remaining:
+            item = await preprocessed.get()
+            if item is None:
+                remaining -= 1
+                continue
+            
+            heic_file, image, error = item
+            if error is not None:
+                on_result(heic_file, {"success": False, "error": error})
+                continue
+            
+            try:
+                start_time = time.perf_counter_ns()
+                text = await loop.run_in_executor(None, ocr.extract_text, image)
+                processing_time = (time.perf_counter_ns() - start_time) / 1e9
+                result = save_ocr_result(str(heic_file), text, processing_time,
+                                         ocr, output_dir)
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+            on_result(heic_file, result)
+    
+    await asyncio.gather(decode_all(), ocr_worker(),
+                         *(preprocess_worker() for _ in range(workers)))
+
 def batch_process_with_custom_words(input_dir: str, output_dir: str, 
-                                  custom_words: List[str]) -> None:
-    """Process all HEIC files in a directory with custom words."""
+                                  custom_words: List[str], workers: int = None,
+                                  backend: str = "process") -> None:
+    """
+    Process all HEIC files in a directory with custom words.
+    
+    Files are spread in chunks of up to BATCH_SIZE over a pool of workers,
+    each holding its own OCR engine and running extract_text_batch() once
+    per chunk, or with backend='pipeline' run through overlapping decode, preprocessing
+    and OCR stages on one engine.
+    
+    Args:
+        input_dir: Directory containing HEIC files
+        output_dir: Directory to save text files
+        custom_words: Custom words for Apple Vision
+        workers: Number of workers (default: CPU count)
+        backend: 'process' for a process pool, 'thread' for a thread pool,
+                 'pipeline' for the asyncio stage pipeline
+    """
+    workers = workers or os.cpu_count() or 1
     
     print("🚀 Batch Processing with Custom Words")
     print("=" * 50)
     print(f"📁 Input directory: {input_dir}")
     print(f"📁 Output directory: {output_dir}")
     print(f"📝 Custom words: {len(custom_words)} terms")
+    print(f"🧵 Workers: {workers} ({backend})")
     print()
     
     # Create output directory
@@ -119,11 +258,12 @@ def batch_process_with_custom_words(input_dir: str, output_dir: str,
     failed = 0
     total_time = 0
     total_words_found = 0
+    completed = 0
     
-    for i, heic_file in enumerate(heic_files, 1):
-        print(f"[{i}/{len(heic_files)}] Processing: {heic_file.name}")
-        
-        result = process_image_with_custom_words(str(heic_file), custom_words, output_dir)
+    def report(heic_file: Path, result: Dict) -> None:
+        nonlocal completed, successful, failed, total_time, total_words_found
+        completed += 1
+        print(f"[{completed}/{len(heic_files)}] Processed: {heic_file.name}")
         
         if result["success"]:
             successful += 1
@@ -144,6 +284,32 @@ def batch_process_with_custom_words(input_dir: str, output_dir: str,
         
         print()
     
+    if backend == "pipeline":
+        asyncio.run(pipeline_process_with_custom_words(heic_files, output_dir, custom_words,
+                                                       workers, report))
+    else:
+        executor_class = ThreadPoolExecutor if backend == "thread" else ProcessPoolExecutor
+        with executor_class(max_workers=workers, initializer=_init_worker,
+                            initargs=(custom_words, backend)) as executor:
+            # Smaller chunks when there are few files, so every worker gets some
+            chunk_size = max(1, min(BATCH_SIZE, -(-len(heic_files) // workers)))
+            chunks = [heic_files[i:i + chunk_size]
+                      for i in range(0, len(heic_files), chunk_size)]
+            futures = {
+                executor.submit(_process_chunk_in_worker,
+                                [str(heic_file) for heic_file in chunk], output_dir): chunk
+                for chunk in chunks
+            }
+            
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    chunk_results = future.result()
+                except Exception as e:
+                    chunk_results = [{"success": False, "error": str(e)}] * len(chunk)
+                for heic_file, result in zip(chunk, chunk_results):
+                    report(heic_file, result)
+    
     # Summary
     print("📊 Batch Processing Summary")
     print("=" * 50)
@@ -157,6 +323,13 @@ def batch_process_with_custom_words(input_dir: str, output_dir: str,
 def main():
     """Main function to run batch processing with custom words."""
     
+    parser = argparse.ArgumentParser(description='Batch OCR of HEIC files with Apple Vision custom words')
+    parser.add_argument('--backend', choices=['thread', 'process', 'pipeline'], default='process',
+                        help='Run workers as processes or threads, or pipeline the stages')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='Number of workers (default: CPU count)')
+    args = parser.parse_args()
+    
     # Configuration
     input_directory = "~/Pictures/TF"
     output_directory = "~/Pictures/TF/custom_words_output"
@@ -171,7 +344,8 @@ def main():
     print()
     
     # Run batch processing
-    batch_process_with_custom_words(input_directory, output_directory, custom_words)
+    batch_process_with_custom_words(input_directory, output_directory, custom_words,
+                                    workers=args.workers, backend=args.backend)
     
     print()
     print("💡 Tips for using custom words:")
@@ -8,103 +8,27 @@ OCR recognition accuracy for different types of content.
 
 import os
 import time
-from typing import List, Dict
-from ocr_engines.apple_vision_ocr import AppleVisionOCREngine
-from utils.text_utils import calculate_text_similarity
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple
+from ocr_engines.apple_vision_ocr import AppleVisionOCREngine, get_engine
+from utils.custom_word_lists import get_programming_custom_words, get_terraform_custom_words
+from utils.text_utils import calculate_text_similarity, find_words_in_tokens
 
-def get_terraform_custom_words() -> List[str]:
-    """Get custom words for Terraform/infrastructure content."""
-    return [
-        # Terraform core
-        "terraform", "provider", "resource", "variable", "output", "module",
-        "data", "locals", "for_each", "count", "depends_on", "lifecycle",
-        
-        # AWS services
-        "aws", "ec2", "s3", "rds", "lambda", "apigateway", "cloudfront",
-        "cloudwatch", "iam", "kms", "secrets", "ssm", "parameter", "store",
-        "vpc", "subnet", "security_group", "route_table", "internet_gateway",
-        "nat_gateway", "load_balancer", "autoscaling", "elasticache",
-        "redshift", "dynamodb", "sqs", "sns", "eventbridge", "stepfunctions",
-        
-        # File extensions and formats
-        "tf", "tfvars", "tfstate", "hcl", "json", "yaml", "yml",
-        
-        # Common technical terms
-        "configuration", "infrastructure", "deployment", "environment",
-        "production", "staging", "development", "testing", "monitoring",
-        "logging", "metrics", "alerting", "backup", "recovery", "disaster",
-        "scalability", "availability", "reliability", "performance",
-        "security", "compliance", "governance", "policy", "access",
-        "authentication", "authorization", "encryption", "decryption"
-    ]
-
-def get_programming_custom_words() -> List[str]:
-    """Get custom words for programming/code content."""
-    return [
-        # Programming languages
-        "python", "javascript", "typescript", "java", "go", "rust", "swift",
-        "kotlin", "php", "ruby", "cpp", "csharp", "scala", "clojure",
-        
-        # Frameworks and libraries
-        "react", "vue", "angular", "nodejs", "express", "django", "flask",
-        "spring", "hibernate", "jpa", "jdbc", "mybatis", "struts",
-        "laravel", "symfony", "codeigniter", "cakephp", "zend",
-        "rails", "sinatra", "hanami", "grape", "padrino",
-        "tornado", "fastapi", "bottle", "cherrypy", "pyramid",
-        
-        # Common programming terms
-        "function", "method", "class", "object", "array", "string", "integer",
-        "boolean", "null", "undefined", "exception", "error", "warning",
-        "debug", "trace", "log", "console", "print", "return", "import",
-        "export", "require", "include", "namespace", "package", "library",
-        "framework", "api", "rest", "graphql", "soap", "grpc", "websocket",
-        "http", "https", "tcp", "udp", "ip", "dns", "ssl", "tls"
-    ]
-
-def get_medical_custom_words() -> List[str]:
-    """Get custom words for medical/healthcare content."""
-    return [
-        # Medical terms
-        "patient", "diagnosis", "treatment", "therapy", "medication", "dosage",
-        "prescription", "symptoms", "condition", "disease", "disorder",
-        "syndrome", "infection", "inflammation", "tumor", "cancer", "benign",
-        "malignant", "metastasis", "remission", "relapse", "prognosis",
-        
-        # Body systems
-        "cardiovascular", "respiratory", "digestive", "nervous", "muscular",
-        "skeletal", "endocrine", "immune", "lymphatic", "urinary", "reproductive",
-        
-        # Medical procedures
-        "surgery", "biopsy", "radiology", "mri", "ct", "xray", "ultrasound",
-        "endoscopy", "colonoscopy", "mammography", "echocardiogram",
-        
-        # Medications
-        "antibiotic", "antiviral", "antifungal", "analgesic", "antipyretic",
-        "antihistamine", "anticoagulant", "diuretic", "beta", "blocker",
-        "ace", "inhibitor", "statin", "insulin", "cortisol", "adrenaline"
-    ]
-
-def get_legal_custom_words() -> List[str]:
-    """Get custom words for legal content."""
-    return [
-        # Legal terms
-        "plaintiff", "defendant", "attorney", "counsel", "judge", "court",
-        "jury", "trial", "hearing", "motion", "objection", "sustained",
-        "overruled", "evidence", "testimony", "witness", "deposition",
-        "subpoena", "warrant", "indictment", "arraignment", "plea",
-        "guilty", "not", "guilty", "nolo", "contendere", "verdict",
-        "sentence", "probation", "parole", "appeal", "conviction",
-        
-        # Legal documents
-        "contract", "agreement", "lease", "deed", "will", "trust",
-        "power", "of", "attorney", "affidavit", "petition", "complaint",
-        "answer", "counterclaim", "cross", "claim", "third", "party",
-        "interrogatories", "requests", "for", "production", "admissions"
-    ]
+def _timed_extract_text(ocr: AppleVisionOCREngine, image) -> Tuple[str, float]:
+    """Extract text and return it with the time the call took."""
+    start_time = time.perf_counter_ns()
+    text = ocr.extract_text(image)
+    return text, (time.perf_counter_ns() - start_time) / 1e9
 
 def test_custom_words_effectiveness(image_path: str, custom_words: List[str], 
                                   content_type: str) -> Dict:
-    """Test the effectiveness of custom words on a specific image."""
+    """
+    Test the effectiveness of custom words on a specific image.
+    
+    Engines come from get_engine(), so the baseline engine (and any
+    vocabulary tested before) is reused across calls instead of rebuilt.
+    The runs without and with custom words are done in parallel threads.
+    """
     
     if not os.path.exists(image_path):
         return {"error": f"Image not found: {image_path}"}
@@ -118,26 +42,24 @@ def test_custom_words_effectiveness(image_path: str, custom_words: List[str],
     from PIL import Image
     image = Image.open(image_path)
     
-    # Test without custom words
-    start_time = time.time()
-    ocr_basic = AppleVisionOCREngine(language="en", custom_words=None)
-    text_basic = ocr_basic.extract_text(image)
-    time_basic = time.time() - start_time
+    ocr_basic = get_engine([])
+    ocr_enhanced = get_engine(custom_words)
     
-    # Test with custom words
-    start_time = time.time()
-    ocr_enhanced = AppleVisionOCREngine(language="en", custom_words=custom_words)
-    text_enhanced = ocr_enhanced.extract_text(image)
-    time_enhanced = time.time() - start_time
+    # Run without and with custom words at the same time; the two engines
+    # have separate Vision requests, so they can run in parallel (unless
+    # there are no custom words and both are the same engine)
+    workers = 1 if ocr_enhanced is ocr_basic else 2
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        basic = executor.submit(_timed_extract_text, ocr_basic, image)
+        enhanced = executor.submit(_timed_extract_text, ocr_enhanced, image)
+        text_basic, time_basic = basic.result()
+        text_enhanced, time_enhanced = enhanced.result()
     
     # Calculate metrics
     similarity = calculate_text_similarity(text_basic, text_enhanced)
     
     # Count custom words found
-    words_found = []
-    for word in custom_words:
-        if word.lower() in text_enhanced.lower():
-            words_found.append(word)
+    words_found = find_words_in_tokens(custom_words, [word.lower() for word in custom_words], text_enhanced)
     
     results = {
         "content_type": content_type,
@@ -10,15 +10,16 @@ import os
 import sys
 import time
 from PIL import Image
-from utils.text_utils import calculate_text_similarity
-from ocr_engines.apple_vision_ocr import AppleVisionOCREngine
-from utils.image_utils import preprocess_image_for_ocr
+from utils.text_utils import calculate_text_similarity, find_words_in_tokens
+from ocr_engines.apple_vision_ocr import AppleVisionOCREngine, pil_to_cgimage
+from utils.image_utils import preprocess_image_for_ocr_pil
+from utils.ocr_cache import image_key, ocr_cache_key, open_ocr_cache
 
 def test_custom_words_improvement():
     """Test how custom words improve OCR recognition."""
     
     # Sample image from TF directory
-    image_path = "~/Pictures/TF/IMG_7518.HEIC"
+    image_path = os.path.expanduser("~/Pictures/TF/IMG_7518.HEIC")
     
     if not os.path.exists(image_path):
         print(f"❌ Image not found: {image_path}")
@@ -30,11 +31,15 @@ def test_custom_words_improvement():
     # Load and preprocess image
     print(f"📷 Loading image: {os.path.basename(image_path)}")
     from utils.image_utils import convert_heic_to_pil
-    image = convert_heic_to_pil(image_path)
+    # Shrink straight to the OCR working size right after decoding, so
+    # preprocessing never touches the full-resolution frame
+    image = convert_heic_to_pil(image_path, max_size=4000)
     if image is None:
         print(f"❌ Could not load image: {image_path}")
         return
-    preprocessed_image = preprocess_image_for_ocr(image)
+    preprocessed_image = preprocess_image_for_ocr_pil(image)
+    # Convert to a CGImage once; every engine below OCRs the same one
+    prepared_image = pil_to_cgimage(preprocessed_image)
     
     # Define custom words based on common Terraform/technical terms
     # These are words that might appear in your technical documents
@@ -80,12 +85,24 @@ def test_custom_words_improvement():
     print("🔍 Test 1: Apple Vision OCR WITHOUT custom words")
     print("-" * 50)
     
-    start_time = time.time()
+    # The baseline only depends on the image, so reuse it from an earlier
+    # run of this script or of domain_custom_words_comparison_test.py
     ocr_without_custom = AppleVisionOCREngine(language="en", custom_words=None)
-    text_without_custom = ocr_without_custom.extract_text(preprocessed_image)
-    time_without_custom = time.time() - start_time
-    
-    print(f"⏱️  Processing time: {time_without_custom:.3f}s")
+    baseline_key = ocr_cache_key('apple_vision', 'en', image_key(preprocessed_image), [],
+                                 ocr_without_custom.cache_settings())
+    with open_ocr_cache() as ocr_cache:
+        baseline_cached = baseline_key in ocr_cache
+        if baseline_cached:
+            text_without_custom, time_without_custom = ocr_cache[baseline_key][:2]
+        else:
+            start_time = time.perf_counter_ns()
+            text_without_custom = ocr_without_custom.extract_text_prepared(prepared_image)
+            time_without_custom = (time.perf_counter_ns() - start_time) / 1e9
+            # Don't keep an empty (likely failed) run for later scripts
+            if text_without_custom.strip():
+                ocr_cache[baseline_key] = (text_without_custom, time_without_custom)
+    
+    print(f"⏱️  Processing time: {time_without_custom:.3f}s{' (cached)' if baseline_cached else ''}")
     print(f"📄 Text length: {len(text_without_custom)} characters")
     print(f"📝 Text preview: {text_without_custom[:100]}...")
     print()
@@ -94,10 +111,11 @@ def test_custom_words_improvement():
     print("🔍 Test 2: Apple Vision OCR WITH custom words")
     print("-" * 50)
     
-    start_time = time.time()
+    # Timed like the baseline: recognition only, not engine setup
     ocr_with_custom = AppleVisionOCREngine(language="en", custom_words=custom_words)
-    text_with_custom = ocr_with_custom.extract_text(preprocessed_image)
-    time_with_custom = time.time() - start_time
+    start_time = time.perf_counter_ns()
+    text_with_custom = ocr_with_custom.extract_text_prepared(prepared_image)
+    time_with_custom = (time.perf_counter_ns() - start_time) / 1e9
     
     print(f"⏱️  Processing time: {time_with_custom:.3f}s")
     print(f"📄 Text length: {len(text_with_custom)} characters")
@@ -112,9 +130,9 @@ def test_custom_words_improvement():
     ocr_dynamic = AppleVisionOCREngine(language="en", custom_words=None)
     
     # Extract text without custom words
-    start_time = time.time()
-    text_dynamic_1 = ocr_dynamic.extract_text(preprocessed_image)
-    time_dynamic_1 = time.time() - start_time
+    start_time = time.perf_counter_ns()
+    text_dynamic_1 = ocr_dynamic.extract_text_prepared(prepared_image)
+    time_dynamic_1 = (time.perf_counter_ns() - start_time) / 1e9
     
     print(f"📝 Without custom words: {len(text_dynamic_1)} chars in {time_dynamic_1:.3f}s")
     
@@ -122,9 +140,9 @@ def test_custom_words_improvement():
     ocr_dynamic.update_custom_words(custom_words)
     
     # Extract text with custom words
-    start_time = time.time()
-    text_dynamic_2 = ocr_dynamic.extract_text(preprocessed_image)
-    time_dynamic_2 = time.time() - start_time
+    start_time = time.perf_counter_ns()
+    text_dynamic_2 = ocr_dynamic.extract_text_prepared(prepared_image)
+    time_dynamic_2 = (time.perf_counter_ns() - start_time) / 1e9
     
     print(f"📝 With custom words: {len(text_dynamic_2)} chars in {time_dynamic_2:.3f}s")
     print()
@@ -146,16 +164,16 @@ def test_custom_words_improvement():
     print(f"   Without custom words: {time_without_custom:.3f}s")
     print(f"   With custom words:    {time_with_custom:.3f}s")
     print(f"   Difference:           {time_with_custom - time_without_custom:+.3f}s")
+    if baseline_cached:
+        print("   ⚠️  Baseline time is from an earlier cached run; the difference is unreliable")
     print()
     
     print(f"🔍 Text similarity: {similarity:.2f}%")
     print()
     
     # Check for specific technical terms
-    technical_terms_found = []
-    for term in custom_words[:20]:  # Check first 20 terms
-        if term.lower() in text_with_custom.lower():
-            technical_terms_found.append(term)
+    terms = custom_words[:20]  # Check first 20 terms
+    technical_terms_found = find_words_in_tokens(terms, [term.lower() for term in terms], text_with_custom)
     
     print(f"🎯 Technical terms detected with custom words: {len(technical_terms_found)}")
     if technical_terms_found:
@@ -13,22 +13,33 @@ by comparing OCR output with ground truth text files.
 
 import os
 import sys
+import functools
+import hashlib
 import itertools
 import time
 import json
+import threading
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, FrozenSet, List, Tuple, Optional
 import logging
 from datetime import datetime
 import tempfile
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 # Add current directory to path
 sys.path.append('.')
 
-from heic2txt_batch import convert_heic_to_png, preprocess_image_for_ocr
+from heic2txt_batch import preprocess_gray_for_ocr
+from utils.image_utils import convert_heic_to_pil
 from ocr_engines.easyocr_engine import EasyOCREngine
-from PIL import Image
-import difflib
+import numpy as np
+from rapidfuzz import fuzz
+
+try:
+    import orjson
+except ImportError:  # Fall back to json in write_results_json
+    orjson = None
 
 
 def setup_logging(log_dir: str) -> logging.Logger:
@@ -62,28 +73,48 @@ def setup_logging(log_dir: str) -> logging.Logger:
     return logger
 
 
+def _read_ground_truth_file(file_path: Path) -> Optional[str]:
+    """Read one ground truth file, returning None if it cannot be read."""
+    try:
+        return file_path.read_text(encoding='utf-8').strip()
+    except Exception as e:
+        print(f"Warning: Could not load {file_path}: {e}")
+        return None
+
+
 def load_ground_truth(test_dir: str) -> Dict[str, str]:
-    """Load ground truth text files."""
-    ground_truth = {}
+    """Load ground truth text files, reading them on a thread pool."""
+    file_paths = [file_path for file_path in Path(test_dir).glob("*.txt")
+                  if not file_path.name.endswith('_comparison.log')]
     
-    for file_path in Path(test_dir).glob("*.txt"):
-        if not file_path.name.endswith('_comparison.log'):
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                    if content:  # Only include non-empty files
-                        # Extract base name (remove .txt extension)
-                        base_name = file_path.stem
-                        ground_truth[base_name] = content
-            except Exception as e:
-                print(f"Warning: Could not load {file_path}: {e}")
+    # File reads release the GIL, so the reads overlap on slow storage
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        contents = list(pool.map(_read_ground_truth_file, file_paths))
     
-    return ground_truth
+    # Only include non-empty files, keyed by base name (without .txt)
+    return {file_path.stem: content
+            for file_path, content in zip(file_paths, contents) if content}
+
+
+@functools.lru_cache(maxsize=64)
+def _ground_truth_forms(text: str) -> Tuple[str, FrozenSet[str]]:
+    """Lowercased text and word set of a ground truth, memoized across parameter combinations."""
+    lower = text.lower()
+    return lower, frozenset(lower.split())
 
 
 def calculate_text_similarity(text1: str, text2: str) -> Dict[str, float]:
-    """Calculate various similarity metrics between two texts."""
-    if not text1 and not text2:
+    """
+    Calculate various similarity metrics between two texts.
+    
+    Args:
+        text1: Ground truth text
+        text2: OCR text
+        
+    Returns:
+        Dictionary of exact_match, sequence_ratio, character_ratio and word_ratio
+    """
+    if text1 == text2:
         return {'exact_match': 1.0, 'sequence_ratio': 1.0, 'character_ratio': 1.0, 'word_ratio': 1.0}
     
     if not text1 or not text2:
@@ -92,17 +123,16 @@ def calculate_text_similarity(text1: str, text2: str) -> Dict[str, float]:
     # Exact match
     exact_match = 1.0 if text1.strip() == text2.strip() else 0.0
     
-    # Sequence matcher ratio
-    sequence_ratio = difflib.SequenceMatcher(None, text1, text2).ratio()
+    # Sequence ratio (2*matches/total), and the same on lowercased text
+    sequence_ratio = fuzz.ratio(text1, text2) / 100.0
+    char_ratio = fuzz.ratio(_ground_truth_forms(text1)[0], text2.lower()) / 100.0
     
-    # Character-level similarity
-    char_ratio = difflib.SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
-    
-    # Word-level similarity
-    words1 = set(text1.lower().split())
+    # Word-level similarity (Jaccard, without building the union set)
+    words1 = _ground_truth_forms(text1)[1]
     words2 = set(text2.lower().split())
     if words1 or words2:
-        word_ratio = len(words1.intersection(words2)) / len(words1.union(words2))
+        common = len(words2.intersection(words1))
+        word_ratio = common / (len(words1) + len(words2) - common)
     else:
         word_ratio = 1.0
     
@@ -114,60 +144,217 @@ def calculate_text_similarity(text1: str, text2: str) -> Dict[str, float]:
     }
 
 
-def test_easyocr_parameters(heic_path: str, ground_truth: str, 
-                           text_threshold: float, low_text: float, link_threshold: float,
-                           logger: logging.Logger) -> Dict:
-    """Test EasyOCR with specific parameters on a single image."""
-    try:
-        # Convert HEIC to PNG
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp_png:
-            png_path = tmp_png.name
-        
-        if not convert_heic_to_png(heic_path, png_path):
-            return {'success': False, 'error': 'HEIC conversion failed'}
-        
-        # Preprocess image
-        preprocessed_path = preprocess_image_for_ocr(png_path)
-        
-        # Initialize EasyOCR with custom parameters
-        ocr_engine = EasyOCREngine(
-            language='en',
-            text_threshold=text_threshold,
-            low_text=low_text,
-            link_threshold=link_threshold
-        )
+def write_results_json(results_file: str, results: Dict) -> None:
+    """Write the optimization results as indented JSON, with orjson when available."""
+    if orjson is not None:
+        with open(results_file, 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(results_file, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+def prepare_image_array(heic_path: str, logger: logging.Logger) -> Optional[np.ndarray]:
+    """
+    Decode a HEIC file in memory and preprocess it.
+    
+    Done once per file; every parameter combination then reuses the pixels.
+    Results are memoized per (path, modification time), so repeated sweeps in
+    the same session skip decoding and preprocessing for unchanged files.
+    
+    Args:
+        heic_path: Path to the HEIC file
+        logger: Logger for errors
         
-        # Load and process image
-        img = Image.open(preprocessed_path)
+    Returns:
+        Preprocessed image as a numpy array, or None if conversion fails
+    """
+    return _prepare_image_array_cached(heic_path, os.path.getmtime(heic_path), logger)
+
+
+@functools.lru_cache(maxsize=32)
+def _prepare_image_array_cached(heic_path: str, mtime: float,
+                                logger: logging.Logger) -> Optional[np.ndarray]:
+    """Uncached body of prepare_image_array(); mtime is only part of the cache key."""
+    try:
+        # Decoded in memory with pyheif, with no PNG round trip
+        image = convert_heic_to_pil(heic_path)
+        if image is None:
+            logger.error(f"HEIC conversion failed for {heic_path}")
+            return None
         
-        # Extract text
-        ocr_text = ocr_engine.extract_text(img)
+        return preprocess_gray_for_ocr(np.asarray(image.convert('L')))
+    except Exception as e:
+        logger.error(f"Error preparing {heic_path}: {e}")
+        return None
+
+
+# Similarity metrics keyed by (ground truth, OCR text digest): parameter
+# combinations that produce byte-identical text are scored only once
+_SIMILARITY_CACHE: Dict[Tuple[str, bytes], Dict[str, float]] = {}
+
+
+def test_easyocr_parameters(ocr_engine: EasyOCREngine, images: List[np.ndarray],
+                           ground_truths: List[str],
+                           text_threshold: float, low_text: float, link_threshold: float,
+                           logger: logging.Logger) -> List[Dict]:
+    """Test EasyOCR with specific parameters on a batch of preprocessed images."""
+    try:
+        # EasyOCR takes the thresholds per readtext() call, so one engine
+        # (with its model already loaded) serves every combination
+        ocr_engine.text_threshold = text_threshold
+        ocr_engine.low_text = low_text
+        ocr_engine.link_threshold = link_threshold
         
-        # Calculate similarity metrics
-        similarity_metrics = calculate_text_similarity(ground_truth, ocr_text)
+        # Extract text from all files in one batched inference pass
+        ocr_texts = ocr_engine.extract_text_batch(images, batch_size=8)
         
-        # Cleanup
-        os.unlink(png_path)
-        if preprocessed_path != png_path:
-            os.unlink(preprocessed_path)
+    except Exception as e:
+        logger.error(f"Error testing parameters {text_threshold}, {low_text}, {link_threshold}: {e}")
+        return [{'success': False, 'error': str(e)} for _ in images]
+    
+    results = []
+    for ground_truth, ocr_text in zip(ground_truths, ocr_texts):
+        # Calculate similarity metrics, once per distinct OCR output
+        cache_key = (ground_truth, hashlib.blake2b(ocr_text.encode('utf-8'), digest_size=16).digest())
+        similarity_metrics = _SIMILARITY_CACHE.get(cache_key)
+        if similarity_metrics is None:
+            similarity_metrics = calculate_text_similarity(ground_truth, ocr_text)
+            _SIMILARITY_CACHE[cache_key] = similarity_metrics
         
-        return {
+        results.append({
             'success': True,
             'ocr_text': ocr_text,
             'ground_truth': ground_truth,
             'similarity_metrics': similarity_metrics,
             'text_length': len(ocr_text),
             'ground_truth_length': len(ground_truth)
-        }
+        })
+    
+    return results
+
+
+def distinct_parameter_combinations(text_thresholds: List[float], low_texts: List[float],
+                                    link_thresholds: List[float]) -> List[Tuple[float, float, float]]:
+    """
+    Grid of (text_threshold, low_text, link_threshold) without equivalent combinations.
+    
+    EasyOCR's detector joins pixels scoring above low_text (or linked above
+    link_threshold) into regions, then drops regions whose peak text score is
+    below text_threshold. When text_threshold <= low_text that check can only
+    drop regions made purely of link pixels, so such text_threshold values give
+    practically identical output; only the first in grid order is kept.
+    
+    Args:
+        text_thresholds: Candidate text_threshold values
+        low_texts: Candidate low_text values
+        link_thresholds: Candidate link_threshold values
         
-    except Exception as e:
-        logger.error(f"Error testing parameters {text_threshold}, {low_text}, {link_threshold}: {e}")
-        return {'success': False, 'error': str(e)}
+    Returns:
+        Distinct parameter combinations, in grid order
+    """
+    distinct = {}
+    for text_thresh, low_text, link_thresh in itertools.product(text_thresholds, low_texts, link_thresholds):
+        effective_text_thresh = text_thresh if text_thresh > low_text else None
+        distinct.setdefault((effective_text_thresh, low_text, link_thresh),
+                            (text_thresh, low_text, link_thresh))
+    return list(distinct.values())
+
+
+def run_combination(ocr_engine: EasyOCREngine, prepared_files: List[Tuple[str, str, np.ndarray]],
+                    params: Tuple[float, float, float], logger: logging.Logger) -> List[Dict]:
+    """Run one parameter combination over every prepared file, in order."""
+    text_thresh, low_text, link_thresh = params
+    images = [image for _, _, image in prepared_files]
+    ground_truths = [ground_truth_text for _, ground_truth_text, _ in prepared_files]
+    return test_easyocr_parameters(ocr_engine, images, ground_truths,
+                                   text_thresh, low_text, link_thresh, logger)
+
+
+# Per-process state for the parallel sweep, set up by _init_worker()
+_WORKER = {}
+
+
+def _init_worker(image_files: List[Tuple[str, str, str]]) -> None:
+    """Load the EasyOCR model and memory-map the prepared images in a worker process."""
+    _WORKER['engine'] = EasyOCREngine(language='en')
+    _WORKER['files'] = [(base_name, ground_truth_text, np.load(npy_path, mmap_mode='r'))
+                        for base_name, ground_truth_text, npy_path in image_files]
+
+
+def _run_combination_in_worker(params: Tuple[float, float, float],
+                               file_range: Tuple[int, int]) -> List[Dict]:
+    """Run one parameter combination on files [start, stop) in a worker process."""
+    start, stop = file_range
+    return run_combination(_WORKER['engine'], _WORKER['files'][start:stop], params,
+                           logging.getLogger('easyocr_optimization'))
+
+
+def _combined_score(file_results: List[Dict]) -> float:
+    """Mean of the average sequence and word ratios over successful results (-1 if none)."""
+    successful = [result['similarity_metrics'] for result in file_results if result['success']]
+    if not successful:
+        return -1.0
+    return sum(m['sequence_ratio'] + m['word_ratio'] for m in successful) / (2 * len(successful))
+
+
+def successive_halving(param_combinations: List[Tuple[float, float, float]], n_files: int,
+                       evaluate: Callable[[List[Tuple[float, float, float]], int, int], List[List[Dict]]],
+                       logger: logging.Logger) -> Dict[Tuple[float, float, float], List[Dict]]:
+    """
+    Search parameter combinations by successive halving over the test files.
+    
+    Every combination is tested on the first file, then the better half on
+    the first two, the better half of those on the first four, and so on,
+    until the survivors have been tested on every file. Files already tested
+    for a combination are never re-run.
+    
+    Args:
+        param_combinations: Candidate (text_threshold, low_text, link_threshold) tuples
+        n_files: Number of prepared test files
+        evaluate: Called as evaluate(combinations, start, stop);
+            returns the results on files [start, stop) for each combination
+        logger: Logger for progress
+        
+    Returns:
+        Results for every combination on the files it was tested on, in the
+        order of param_combinations
+    """
+    results = {params: [] for params in param_combinations}
+    survivors = list(param_combinations)
+    tested = 0
+    stop = min(1, n_files)
+    
+    while tested < n_files:
+        if len(survivors) == 1:
+            stop = n_files
+        
+        logger.info("Testing %d combinations on files %d-%d of %d",
+                    len(survivors), tested + 1, stop, n_files)
+        for params, file_results in zip(survivors, evaluate(survivors, tested, stop)):
+            results[params].extend(file_results)
+        tested = stop
+        
+        # Keep the better half (stable, so ties keep grid order)
+        survivors.sort(key=lambda params: _combined_score(results[params]), reverse=True)
+        survivors = survivors[:max(1, len(survivors) // 2)]
+        stop = min(n_files, stop * 2)
+    
+    return results
 
 
 def run_parameter_optimization(test_dir: str, output_dir: str, 
-                              max_files: int = 10) -> None:
-    """Run parameter optimization on test files."""
+                              max_files: int = 10, workers: int = 1) -> None:
+    """
+    Run parameter optimization on test files.
+    
+    Args:
+        test_dir: Directory with HEIC files and their ground truth .txt files
+        output_dir: Directory for the log and results JSON
+        max_files: Maximum number of files to test
+        workers: Number of processes evaluating parameter combinations in
+            parallel; each loads its own EasyOCR model
+    """
     
     # Setup logging
     logger = setup_logging(output_dir)
@@ -198,32 +385,69 @@ def run_parameter_optimization(test_dir: str, output_dir: str,
     low_texts = [0.2, 0.3, 0.4, 0.5]
     link_thresholds = [0.4, 0.5, 0.6, 0.7]
     
-    # Generate all parameter combinations
-    param_combinations = list(itertools.product(text_thresholds, low_texts, link_thresholds))
+    # Generate all parameter combinations that can give different results
+    param_combinations = distinct_parameter_combinations(text_thresholds, low_texts, link_thresholds)
     logger.info(f"Testing {len(param_combinations)} parameter combinations")
     
+    # Convert and preprocess each file once, independent of the parameters.
+    # pyheif decoding and OpenCV release the GIL, so files prepare in parallel
+    logger.info(f"Preparing {len(heic_files)} files...")
+    with ThreadPoolExecutor(max_workers=4) as prepare_pool:
+        images = list(prepare_pool.map(lambda heic_file: prepare_image_array(heic_file[0], logger),
+                                       heic_files))
+    prepared_files = [(base_name, ground_truth_text, image)
+                      for (_, base_name, ground_truth_text), image in zip(heic_files, images)
+                      if image is not None]
+    
     # Results storage
     all_results = []
     best_combination = None
     best_score = 0.0
     
+    with contextlib.ExitStack() as stack:
+        if workers > 1:
+            # Hand the images to the workers as .npy files they memory-map,
+            # rather than pickling the arrays into every process (on tmpfs
+            # where there is one, so they never touch the disk)
+            shm_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+            npy_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix='heic_opt_', dir=shm_dir))
+            image_files = []
+            for index, (base_name, ground_truth_text, image) in enumerate(prepared_files):
+                npy_path = os.path.join(npy_dir, f"{index}.npy")
+                np.save(npy_path, image)
+                image_files.append((base_name, ground_truth_text, npy_path))
+            
+            logger.info(f"Evaluating combinations on {workers} worker processes")
+            pool = stack.enter_context(ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                                           initargs=(image_files,)))
+            
+            def evaluate(combinations, start, stop):
+                return list(pool.map(_run_combination_in_worker, combinations,
+                                     itertools.repeat((start, stop))))
+        else:
+            # Load the EasyOCR model once for the whole sweep
+            ocr_engine = EasyOCREngine(language='en')
+            
+            def evaluate(combinations, start, stop):
+                return [run_combination(ocr_engine, prepared_files[start:stop], params, logger)
+                        for params in combinations]
+        
+        combination_outputs = successive_halving(param_combinations, len(prepared_files),
+                                                 evaluate, logger)
+    
     # Test each parameter combination
-    for i, (text_thresh, low_text, link_thresh) in enumerate(param_combinations):
-        logger.info(f"Testing combination {i+1}/{len(param_combinations)}: "
-                   f"text_threshold={text_thresh}, low_text={low_text}, link_threshold={link_thresh}")
+    for i, ((text_thresh, low_text, link_thresh), file_results) in enumerate(
+            combination_outputs.items()):
+        logger.info("Testing combination %d/%d: text_threshold=%s, low_text=%s, link_threshold=%s",
+                    i + 1, len(param_combinations), text_thresh, low_text, link_thresh)
         
         combination_results = []
         total_sequence_ratio = 0.0
         total_word_ratio = 0.0
         successful_tests = 0
         
-        for heic_path, base_name, ground_truth_text in heic_files:
-            logger.info(f"  Testing {base_name}...")
-            
-            result = test_easyocr_parameters(
-                heic_path, ground_truth_text, 
-                text_thresh, low_text, link_thresh, logger
-            )
+        for (base_name, ground_truth_text, _), result in zip(prepared_files, file_results):
+            logger.debug("  Testing %s...", base_name)
             
             if result['success']:
                 combination_results.append({
@@ -236,17 +460,19 @@ def run_parameter_optimization(test_dir: str, output_dir: str,
                 total_word_ratio += result['similarity_metrics']['word_ratio']
                 successful_tests += 1
                 
-                # Log detailed comparison
-                logger.info(f"    Sequence ratio: {result['similarity_metrics']['sequence_ratio']:.3f}")
-                logger.info(f"    Word ratio: {result['similarity_metrics']['word_ratio']:.3f}")
-                logger.info(f"    OCR length: {result['text_length']}, Ground truth length: {result['ground_truth_length']}")
+                # Log detailed comparison (formatted lazily, only if emitted)
+                logger.info("    Sequence ratio: %.3f", result['similarity_metrics']['sequence_ratio'])
+                logger.info("    Word ratio: %.3f", result['similarity_metrics']['word_ratio'])
+                logger.info("    OCR length: %d, Ground truth length: %d",
+                            result['text_length'], result['ground_truth_length'])
                 
                 # Log text differences
-                if result['similarity_metrics']['sequence_ratio'] < 0.8:  # Only log significant differences
-                    logger.info(f"    Ground truth: {ground_truth_text[:100]}...")
-                    logger.info(f"    OCR result:   {result['ocr_text'][:100]}...")
+                if (logger.isEnabledFor(logging.INFO)
+                        and result['similarity_metrics']['sequence_ratio'] < 0.8):  # Only log significant differences
+                    logger.info("    Ground truth: %s...", ground_truth_text[:100])
+                    logger.info("    OCR result:   %s...", result['ocr_text'][:100])
             else:
-                logger.error(f"    Failed: {result.get('error', 'Unknown error')}")
+                logger.error("    Failed: %s", result.get('error', 'Unknown error'))
         
         # Calculate average metrics for this combination
         if successful_tests > 0:
@@ -264,35 +490,36 @@ def run_parameter_optimization(test_dir: str, output_dir: str,
                 'avg_word_ratio': avg_word_ratio,
                 'combined_score': combined_score,
                 'successful_tests': successful_tests,
-                'total_tests': len(heic_files),
+                'total_tests': len(file_results),
                 'detailed_results': combination_results
             }
             
             all_results.append(combination_summary)
             
-            # Check if this is the best combination so far
-            if combined_score > best_score:
+            # Check if this is the best combination so far (among those
+            # that survived to be tested on every file)
+            if len(file_results) == len(prepared_files) and combined_score > best_score:
                 best_score = combined_score
                 best_combination = combination_summary
-                logger.info(f"  New best combination! Score: {combined_score:.3f}")
+                logger.info("  New best combination! Score: %.3f", combined_score)
             else:
-                logger.info(f"  Score: {combined_score:.3f}")
+                logger.info("  Score: %.3f", combined_score)
         else:
             logger.error(f"  No successful tests for this combination")
     
-    # Save results
+    # Save results on a background thread while the summary is logged
     results_file = os.path.join(output_dir, 'optimization_results.json')
-    with open(results_file, 'w') as f:
-        json.dump({
-            'best_combination': best_combination,
-            'all_results': all_results,
-            'test_files': [f[1] for f in heic_files],
-            'parameter_ranges': {
-                'text_thresholds': text_thresholds,
-                'low_texts': low_texts,
-                'link_thresholds': link_thresholds
-            }
-        }, f, indent=2)
+    results_writer = threading.Thread(target=write_results_json, args=(results_file, {
+        'best_combination': best_combination,
+        'all_results': all_results,
+        'test_files': [f[1] for f in heic_files],
+        'parameter_ranges': {
+            'text_thresholds': text_thresholds,
+            'low_texts': low_texts,
+            'link_thresholds': link_thresholds
+        }
+    }))
+    results_writer.start()
     
     # Print summary
     logger.info("\n" + "="*60)
@@ -311,8 +538,9 @@ def run_parameter_optimization(test_dir: str, output_dir: str,
     else:
         logger.error("No successful parameter combinations found!")
     
-    # Sort all results by combined score
-    sorted_results = sorted(all_results, key=lambda x: x['combined_score'], reverse=True)
+    # Sort all results by how far they got in the search, then combined score
+    sorted_results = sorted(all_results, key=lambda x: (x['total_tests'], x['combined_score']),
+                            reverse=True)
     logger.info(f"\nTop 5 parameter combinations:")
     for i, result in enumerate(sorted_results[:5]):
         params = result['parameters']
@@ -320,6 +548,7 @@ def run_parameter_optimization(test_dir: str, output_dir: str,
                    f"low_text={params['low_text']}, link_threshold={params['link_threshold']} "
                    f"(score: {result['combined_score']:.3f})")
     
+    results_writer.join()
     logger.info(f"\nDetailed results saved to: {results_file}")
 
 
@@ -328,10 +557,11 @@ if __name__ == "__main__":
     test_directory = "~/Pictures/TF"
     output_directory = "./optimization_results"
     max_test_files = 5  # Start with 5 files for initial testing
+    workers = 4  # Each worker process loads its own EasyOCR model
     
     print(f"Starting EasyOCR parameter optimization...")
     print(f"Test directory: {test_directory}")
     print(f"Output directory: {output_directory}")
     print(f"Max test files: {max_test_files}")
     
-    run_parameter_optimization(test_directory, output_directory, max_test_files)
\ No newline at end of file
+    run_parameter_optimization(test_directory, output_directory, max_test_files, workers)
\ No newline at end of file
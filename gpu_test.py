@@ -4,7 +4,6 @@ Test script to demonstrate GPU acceleration with warning suppression.
 """
 
 import sys
-import io
 import warnings
 import os
 from contextlib import redirect_stderr, redirect_stdout
@@ -18,9 +17,12 @@ def test_gpu_acceleration():
     print('🚀 GPU Acceleration Test with Warning Suppression')
     print('=' * 60)
     
-    # Redirect stderr to suppress warnings
-    stderr_backup = sys.stderr
-    sys.stderr = io.StringIO()
+    # Point file descriptor 2 at /dev/null to suppress warnings, including
+    # those torch and EasyOCR write from C code, without buffering them
+    sys.stderr.flush()
+    devnull_fd = os.open(os.devnull, os.O_WRONLY)
+    saved_stderr_fd = os.dup(2)
+    os.dup2(devnull_fd, 2)
     
     try:
         from heic2txt import HEIC2TXT
@@ -57,7 +59,10 @@ def test_gpu_acceleration():
         print(f'❌ Error: {e}')
     finally:
         # Restore stderr
-        sys.stderr = stderr_backup
+        sys.stderr.flush()
+        os.dup2(saved_stderr_fd, 2)
+        os.close(devnull_fd)
+        os.close(saved_stderr_fd)
 
 if __name__ == '__main__':
     test_gpu_acceleration()
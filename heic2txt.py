@@ -7,10 +7,15 @@ and saves the results as text files.
 """
 
 import argparse
+import functools
+import importlib.metadata
 import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import click
 from tqdm import tqdm
@@ -20,14 +25,71 @@ from ocr_engines.easyocr_engine import EasyOCREngine
 from ocr_engines.paddle_ocr import PaddleOCREngine
 from ocr_engines.apple_vision_ocr import AppleVisionOCREngine
 from utils.image_utils import convert_heic_to_pil, is_heic_file
+from utils.ocr_cache import OCR_CACHE_FILE, evict_oldest, file_key, ocr_cache_key, open_ocr_cache
 from utils.text_utils import preprocess_text, save_text_to_file
 
+# Engines whose extract_text() may be called from several threads at once.
+# pytesseract runs each call in its own tesseract process; the torch, Paddle
+# and Vision based engines share per-engine model or request state.
+THREAD_SAFE_ENGINES = frozenset({"tesseract"})
+
+# shelve is not safe for concurrent use, so batch threads take turns
+# (open_ocr_cache() itself locks the file against other processes)
+_OCR_CACHE_LOCK = threading.Lock()
+
+# Package whose version goes into each engine's OCR cache key
+_ENGINE_PACKAGES = {
+    "tesseract": "pytesseract",
+    "easyocr": "easyocr",
+    "paddleocr": "paddleocr",
+    "apple_vision": "pyobjc-framework-Vision",
+}
+
+
+@functools.lru_cache(maxsize=8)
+def _build_engine(engine: str, language: str, custom_words: Optional[Tuple[str, ...]]):
+    """
+    Create an OCR engine, or return the one already loaded for these settings.
+    
+    Loading model weights dominates start-up, so every HEIC2TXT in the
+    process with the same engine, language and custom words shares one
+    engine instance.
+    
+    Args:
+        engine: OCR engine name
+        language: Language code for OCR
+        custom_words: Custom words as a tuple (Apple Vision only), or None
+        
+    Returns:
+        OCR engine instance
+    """
+    if engine == "easyocr":
+        return EasyOCREngine(language=language)
+    elif engine == "tesseract":
+        return TesseractOCR(language=language)
+    elif engine == "paddleocr":
+        return PaddleOCREngine(language=language)
+    elif engine == "apple_vision":
+        return AppleVisionOCREngine(language=language,
+                                    custom_words=list(custom_words) if custom_words else None)
+    else:
+        raise ValueError(f"Unsupported OCR engine: {engine}")
+
 
 class HEIC2TXT:
-    """Main class for HEIC to text conversion."""
+    """
+    Main class for HEIC to text conversion.
+    
+    The OCR engine in self.ocr comes from _build_engine() and is shared by
+    every converter in the process with the same engine, language and custom
+    words. Treat it as read-only: changing its settings (e.g. EasyOCR
+    thresholds or update_custom_words()) would affect those other converters.
+    Build a separate engine instance for that instead.
+    """
     
     def __init__(self, engine: str = "tesseract", language: str = "eng", 
-                 preprocess: bool = False, verbose: bool = False, custom_words: List[str] = None):
+                 preprocess: bool = False, verbose: bool = False, custom_words: List[str] = None,
+                 workers: int = None, use_cache: bool = False, cache_path: str = OCR_CACHE_FILE):
         """
         Initialize the HEIC2TXT converter.
         
@@ -37,24 +99,52 @@ class HEIC2TXT:
             preprocess: Whether to preprocess extracted text
             verbose: Enable verbose output
             custom_words: List of custom words to improve recognition (Apple Vision only)
+            workers: Files converted concurrently by convert_batch() (default: CPU
+                count; always 1 for engines not in THREAD_SAFE_ENGINES)
+            use_cache: Reuse OCR results for files whose contents were already
+                converted with the same engine, settings, language and custom words
+            cache_path: OCR result cache file used when use_cache is set
         """
         self.engine = engine
         self.language = language
         self.preprocess = preprocess
         self.verbose = verbose
         self.custom_words = custom_words
+        self.workers = workers or os.cpu_count() or 1
+        self.use_cache = use_cache
+        self.cache_path = cache_path
+        self._cache_settings = None
         
-        # Initialize OCR engine
-        if engine == "easyocr":
-            self.ocr = EasyOCREngine(language=language)
-        elif engine == "tesseract":
-            self.ocr = TesseractOCR(language=language)
-        elif engine == "paddleocr":
-            self.ocr = PaddleOCREngine(language=language)
-        elif engine == "apple_vision":
-            self.ocr = AppleVisionOCREngine(language=language, custom_words=custom_words)
-        else:
-            raise ValueError(f"Unsupported OCR engine: {engine}")
+        # Initialize OCR engine (shared with other converters using the same
+        # settings; see the class docstring)
+        self.ocr = _build_engine(engine, language, tuple(custom_words) if custom_words else None)
+    
+    def _engine_settings(self) -> str:
+        """
+        Describe the engine for the OCR cache key.
+        
+        Includes the engine class, its package version, its public scalar
+        attributes (language, thresholds, ...) and the engine's own
+        cache_settings() where it has one, so results cached before an
+        upgrade or a configuration change are not reused.
+        
+        Returns:
+            Settings string for ocr_cache_key()
+        """
+        if self._cache_settings is None:
+            try:
+                version = importlib.metadata.version(_ENGINE_PACKAGES[self.engine])
+            except importlib.metadata.PackageNotFoundError:
+                version = "unknown"
+            settings = sorted((name, value) for name, value in vars(self.ocr).items()
+                              if not name.startswith('_')
+                              and isinstance(value, (str, int, float, bool)))
+            self._cache_settings = f"{type(self.ocr).__name__}:{version}:{settings}"
+            # Engines whose configuration lives outside plain attributes
+            # (e.g. Apple Vision's request) describe it themselves
+            if hasattr(self.ocr, 'cache_settings'):
+                self._cache_settings += ":" + self.ocr.cache_settings()
+        return self._cache_settings
     
     def convert_file(self, input_path: str, output_path: Optional[str] = None) -> bool:
         """
@@ -75,14 +165,32 @@ class HEIC2TXT:
             if self.verbose:
                 print(f"Processing: {input_path}")
             
-            # Convert HEIC to PIL Image
-            image = convert_heic_to_pil(input_path)
-            if image is None:
-                print(f"Error: Could not convert {input_path}")
-                return False
+            # Look up the OCR result of an identical file from an earlier run
+            cached = None
+            if self.use_cache:
+                cache_key = ocr_cache_key(self.engine, self.language, file_key(input_path),
+                                          self.custom_words or (), self._engine_settings())
+                with _OCR_CACHE_LOCK, open_ocr_cache(self.cache_path) as cache:
+                    cached = cache.get(cache_key)
             
-            # Extract text using OCR
-            text = self.ocr.extract_text(image)
+            if cached is not None:
+                text = cached[0]
+                if self.verbose:
+                    print(f"Using cached OCR result for: {input_path}")
+            else:
+                # Convert HEIC to PIL Image
+                image = convert_heic_to_pil(input_path)
+                if image is None:
+                    print(f"Error: Could not convert {input_path}")
+                    return False
+                
+                # Extract text using OCR
+                start = time.perf_counter()
+                text = self.ocr.extract_text(image)
+                if self.use_cache and text.strip():
+                    with _OCR_CACHE_LOCK, open_ocr_cache(self.cache_path) as cache:
+                        cache[cache_key] = (text, time.perf_counter() - start, time.time())
+                        evict_oldest(cache)
             if not text.strip():
                 print(f"Warning: No text found in {input_path}")
                 return False
@@ -134,12 +242,17 @@ class HEIC2TXT:
         
         print(f"Found {len(heic_files)} HEIC files to process")
         
-        # Process files with progress bar
+        workers = self.workers if self.engine in THREAD_SAFE_ENGINES else 1
+        
+        # Process files on a thread pool with progress bar
         successful = 0
-        for heic_file in tqdm(heic_files, desc="Converting HEIC files"):
-            output_file = output_path / f"{heic_file.stem}.txt"
-            if self.convert_file(str(heic_file), str(output_file)):
-                successful += 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self.convert_file, str(heic_file),
+                                       str(output_path / f"{heic_file.stem}.txt"))
+                       for heic_file in heic_files]
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Converting HEIC files"):
+                if future.result():
+                    successful += 1
         
         print(f"Successfully converted {successful}/{len(heic_files)} files")
 
@@ -158,7 +271,13 @@ class HEIC2TXT:
               help='Preprocess extracted text')
 @click.option('--verbose', '-v', is_flag=True, 
               help='Enable verbose output')
-def main(input_files, batch, output, engine, language, preprocess, verbose):
+@click.option('--workers', '-j', type=int, default=None,
+              help='Files to convert concurrently in batch mode (default: CPU count)')
+@click.option('--cache/--no-cache', default=False,
+              help='Reuse OCR results cached from earlier runs of unchanged files (default: off)')
+@click.option('--cache-file', type=click.Path(dir_okay=False), default=OCR_CACHE_FILE,
+              show_default=True, help='OCR result cache file used with --cache')
+def main(input_files, batch, output, engine, language, preprocess, verbose, workers, cache, cache_file):
     """
     HEIC2TXT - Convert HEIC images to text using OCR.
     
@@ -176,7 +295,10 @@ def main(input_files, batch, output, engine, language, preprocess, verbose):
         engine=engine,
         language=language,
         preprocess=preprocess,
-        verbose=verbose
+        verbose=verbose,
+        workers=workers,
+        use_cache=cache,
+        cache_path=cache_file
     )
     
     if batch:
@@ -64,7 +64,7 @@ def process_image_with_custom_words(image_path: str, custom_words: List[str], ou
     # Initialize OCR with custom words
     try:
         from ocr_engines.apple_vision_ocr import AppleVisionOCREngine
-        from utils.text_utils import save_text_to_file
+        from utils.text_utils import find_words_in_tokens, save_text_to_file
         from PIL import Image
         
         ocr = AppleVisionOCREngine(language="en", custom_words=custom_words)
@@ -143,10 +143,7 @@ def process_image_with_custom_words(image_path: str, custom_words: List[str], ou
             return {"success": False, "error": "Could not save text file"}
         
         # Count custom words found
-        words_found = []
-        for word in custom_words:
-            if word.lower() in final_text.lower():
-                words_found.append(word)
+        words_found = find_words_in_tokens(custom_words, [word.lower() for word in custom_words], final_text)
         
         print(f"✅ Apple Vision OCR extracted {len(final_text)} characters")
         print(f"🎯 Custom words found: {len(words_found)}/{len(custom_words)}")
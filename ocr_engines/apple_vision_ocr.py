@@ -6,13 +6,59 @@ This module provides OCR functionality using Apple's Vision framework
 via PyObjC bindings.
 """
 
-import os
-import tempfile
-from typing import List, Tuple, Optional
+import functools
+import importlib.metadata
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Tuple, Optional
 from PIL import Image
 import objc
-from Vision import VNRecognizeTextRequest, VNImageRequestHandler
-from Foundation import NSData, NSURL
+import Quartz
+from Vision import VNRecognizeTextRequest, VNImageRequestHandler, VNSequenceRequestHandler
+from Foundation import NSArray, NSData
+
+
+def pil_to_cgimage(image: Image.Image):
+    """
+    Convert a PIL image to a CGImage without going through an image file.
+    
+    Args:
+        image: PIL Image object
+        
+    Returns:
+        CGImageRef backed by the image's raw pixels: one gray byte per pixel
+        for grayscale ('L') images, RGBA otherwise
+    """
+    width, height = image.size
+    
+    if image.mode == 'L':
+        # Preprocessed OCR input is grayscale; keep it at a quarter of the
+        # bytes instead of expanding it to RGBA
+        data = image.tobytes()
+        provider = Quartz.CGDataProviderCreateWithData(None, data, len(data), None)
+        return Quartz.CGImageCreate(
+            width, height, 8, 8, width,
+            Quartz.CGColorSpaceCreateDeviceGray(),
+            Quartz.kCGImageAlphaNone,
+            provider, None, False,
+            Quartz.kCGRenderingIntentDefault,
+        )
+    
+    if image.mode != 'RGBA':
+        image = image.convert('RGBA')
+    
+    data = image.tobytes()
+    provider = Quartz.CGDataProviderCreateWithData(None, data, len(data), None)
+    
+    return Quartz.CGImageCreate(
+        width, height, 8, 32, width * 4,
+        Quartz.CGColorSpaceCreateDeviceRGB(),
+        Quartz.kCGImageAlphaPremultipliedLast,
+        provider, None, False,
+        Quartz.kCGRenderingIntentDefault,
+    )
 
 
 class AppleVisionOCREngine:
@@ -32,7 +78,9 @@ class AppleVisionOCREngine:
             custom_words: List of custom words to improve recognition accuracy
         """
         self.language = language
-        self.custom_words = custom_words or []
+        self._set_words(custom_words)
+        self._handler = None
+        self._prepared = None
         self.engine_name = "Apple Vision"
         print(f"🔍 Initializing {self.engine_name} OCR engine (language: {language})")
         if self.custom_words:
@@ -66,6 +114,118 @@ class AppleVisionOCREngine:
                 print(f"⚠️  Warning: Could not set language to {language}: {e}")
                 print("   Falling back to English")
     
+    def _set_words(self, custom_words: List[str]) -> None:
+        """Store the custom words along with their lowercase forms."""
+        self.custom_words = custom_words or []
+        self._words_tuple = tuple(self.custom_words)
+        self._words_lower = tuple(word.lower() for word in self._words_tuple)
+    
+    @property
+    def words_lower(self) -> Tuple[str, ...]:
+        """The custom words in lowercase, in order, for find_words_in_tokens()."""
+        return self._words_lower
+    
+    def cache_settings(self) -> str:
+        """
+        Describe the request configuration for OCR cache keys.
+        
+        Covers everything besides language and custom words that changes what
+        Vision returns: recognition level, minimum text height, language
+        correction and detection, and the PyObjC Vision bindings version.
+        
+        Returns:
+            Settings string for ocr_cache_key()
+        """
+        try:
+            version = importlib.metadata.version("pyobjc-framework-Vision")
+        except importlib.metadata.PackageNotFoundError:
+            version = "unknown"
+        request = self.text_request
+        return (f"{type(self).__name__}:{version}"
+                f":level={request.recognitionLevel()}"
+                f":min_height={request.minimumTextHeight()}"
+                f":correction={bool(request.usesLanguageCorrection())}"
+                f":auto_language={bool(request.automaticallyDetectsLanguage())}")
+    
+    def prewarm(self) -> None:
+        """
+        Build the request handler up front so every call reuses it.
+        
+        The VNRecognizeTextRequest is created in __init__; this adds a
+        VNSequenceRequestHandler, which (unlike VNImageRequestHandler) is not
+        tied to a single image.
+        """
+        if self._handler is None:
+            self._handler = VNSequenceRequestHandler.alloc().init()
+    
+    def prepare_image(self, image: Image.Image):
+        """
+        Convert an image to the form Vision works on, for repeated OCR runs.
+        
+        The CGImage for the most recent PIL image passed here is kept, so
+        calling this again with the same image object (e.g. after
+        update_custom_words()) skips the conversion. The image is matched by
+        identity, size and mode, so an image edited in place between calls
+        should be passed as a copy. extract_text() and the other PIL entry
+        points always convert afresh and never use this cache.
+        
+        Args:
+            image: PIL Image object
+            
+        Returns:
+            Prepared image to pass to extract_text_prepared()
+        """
+        cached = self._prepared
+        if cached is not None and cached[0]() is image and cached[1] == (image.size, image.mode):
+            return cached[2]
+        cgimage = pil_to_cgimage(image)
+        self._prepared = (weakref.ref(image), (image.size, image.mode), cgimage)
+        return cgimage
+    
+    def _perform_request(self, image: Image.Image) -> bool:
+        """
+        Run the text request on an image.
+        
+        Args:
+            image: PIL Image object
+            
+        Returns:
+            True if Vision processed the image, False otherwise
+        """
+        return self._perform_request_prepared(pil_to_cgimage(image))
+    
+    def _perform_request_prepared(self, prepared) -> bool:
+        """
+        Run the text request on an image from prepare_image().
+        
+        Args:
+            prepared: Image returned by prepare_image()
+            
+        Returns:
+            True if Vision processed the image, False otherwise
+        """
+        self.prewarm()
+        
+        error = None
+        return self._handler.performRequests_onCGImage_error_([self.text_request], prepared, error)
+    
+    def _collect_text(self, request=None) -> str:
+        """Join the top candidate of every observation from the last run of a request."""
+        text_results = (request or self.text_request).results()
+        if not text_results:
+            return ""
+        
+        extracted_text = ""
+        for observation in text_results:
+            if hasattr(observation, 'topCandidates_'):
+                candidates = observation.topCandidates_(1)
+                if candidates and len(candidates) > 0:
+                    candidate = candidates[0]
+                    if hasattr(candidate, 'string'):
+                        extracted_text += candidate.string() + "\n"
+        
+        return extracted_text.strip()
+    
     def extract_text(self, image: Image.Image) -> str:
         """
         Extract text from an image using Apple Vision.
@@ -73,52 +233,44 @@ class AppleVisionOCREngine:
         Args:
             image: PIL Image object
             
+        Returns:
+            Extracted text as string
+        """
+        try:
+            prepared = pil_to_cgimage(image)
+        except Exception as e:
+            print(f"❌ Apple Vision OCR error: {e}")
+            return ""
+        
+        return self.extract_text_prepared(prepared)
+    
+    def extract_text_prepared(self, prepared) -> str:
+        """
+        Extract text from an image already converted with prepare_image().
+        
+        Lets the same image be OCR'd repeatedly (e.g. with different custom
+        words) without converting it again each time.
+        
+        Args:
+            prepared: Image returned by prepare_image()
+            
         Returns:
             Extracted text as string
         """
         print("🔍 Extracting text with Apple Vision OCR...")
         
         try:
-            # Convert PIL image to temporary file
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp_file:
-                image.save(temp_file.name, 'PNG')
-                temp_path = temp_file.name
-            
-            # Create NSURL from file path
-            file_url = NSURL.fileURLWithPath_(temp_path)
-            
-            # Create image request handler
-            request_handler = VNImageRequestHandler.alloc().initWithURL_options_(file_url, None)
-            
-            # Perform text recognition
-            error = None
-            success = request_handler.performRequests_error_([self.text_request], error)
-            
-            if not success:
+            if not self._perform_request_prepared(prepared):
                 print("❌ Apple Vision OCR failed")
                 return ""
             
-            # Extract text from results
-            text_results = self.text_request.results()
-            if not text_results:
+            extracted_text = self._collect_text()
+            if not extracted_text:
                 print("ℹ️  No text detected in image")
                 return ""
             
-            # Combine all detected text
-            extracted_text = ""
-            for observation in text_results:
-                if hasattr(observation, 'topCandidates_'):
-                    candidates = observation.topCandidates_(1)
-                    if candidates and len(candidates) > 0:
-                        candidate = candidates[0]
-                        if hasattr(candidate, 'string'):
-                            extracted_text += candidate.string() + "\n"
-            
-            # Clean up temporary file
-            os.unlink(temp_path)
-            
             print(f"✅ Apple Vision OCR extracted {len(extracted_text)} characters")
-            return extracted_text.strip()
+            return extracted_text
             
         except Exception as e:
             print(f"❌ Apple Vision OCR error: {e}")
@@ -136,47 +288,100 @@ class AppleVisionOCREngine:
         """
         
         try:
-            # Convert PIL image to temporary file
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp_file:
-                image.save(temp_file.name, 'PNG')
-                temp_path = temp_file.name
-            
-            # Create NSURL from file path
-            file_url = NSURL.fileURLWithPath_(temp_path)
-            
-            # Create image request handler
-            request_handler = VNImageRequestHandler.alloc().initWithURL_options_(file_url, None)
-            
-            # Perform text recognition
-            error = None
-            success = request_handler.performRequests_error_([self.text_request], error)
-            
-            if not success:
+            if not self._perform_request(image):
                 return ""
             
-            # Extract text from results
-            text_results = self.text_request.results()
-            if not text_results:
-                return ""
-            
-            # Combine all detected text
-            extracted_text = ""
-            for observation in text_results:
-                if hasattr(observation, 'topCandidates_'):
-                    candidates = observation.topCandidates_(1)
-                    if candidates and len(candidates) > 0:
-                        candidate = candidates[0]
-                        if hasattr(candidate, 'string'):
-                            extracted_text += candidate.string() + "\n"
-            
-            # Clean up temporary file
-            os.unlink(temp_path)
-            
-            return extracted_text.strip()
+            return self._collect_text()
             
         except Exception as e:
             return ""
     
+    def extract_text_batch(self, images: Iterable[Image.Image]) -> List[str]:
+        """
+        Extract text from several images with one request and handler.
+        
+        Images are processed one after another on the engine's retained
+        request, so a generator can feed them in without holding the whole
+        batch in memory.
+        
+        Args:
+            images: PIL Image objects
+            
+        Returns:
+            Extracted text for each image, in order ("" where nothing was found)
+        """
+        texts = []
+        for image in images:
+            try:
+                texts.append(self._collect_text() if self._perform_request(image) else "")
+            except Exception as e:
+                print(f"❌ Apple Vision OCR error: {e}")
+                texts.append("")
+        
+        print(f"✅ Apple Vision OCR processed {len(texts)} images")
+        return texts
+    
+    def _request_with_words(self, custom_words: List[str]):
+        """Create a text request with this engine's settings and other custom words."""
+        request = VNRecognizeTextRequest.alloc().init()
+        request.setRecognitionLevel_(self.text_request.recognitionLevel())
+        request.setUsesLanguageCorrection_(self.text_request.usesLanguageCorrection())
+        request.setMinimumTextHeight_(self.text_request.minimumTextHeight())
+        request.setAutomaticallyDetectsLanguage_(self.text_request.automaticallyDetectsLanguage())
+        request.setUsesCPUOnly_(self.text_request.usesCPUOnly())
+        request.setRecognitionLanguages_(self.text_request.recognitionLanguages())
+        if custom_words:
+            request.setCustomWords_(NSArray.arrayWithArray_(list(custom_words)))
+        return request
+    
+    def extract_text_per_vocabulary(self, image: Image.Image,
+                                    custom_words_list: List[List[str]],
+                                    workers: int = 1) -> List[Tuple[str, float]]:
+        """
+        Extract text from one image once per custom word list.
+        
+        The image is converted to a CGImage once; each word list gets its own
+        request. With several workers the requests run on a thread pool, each
+        thread wrapping the shared CGImage in its own VNImageRequestHandler
+        (Vision releases the GIL while it recognizes).
+        
+        Args:
+            image: PIL Image object
+            custom_words_list: Custom word lists to run OCR with
+            workers: Number of threads to run the requests on
+            
+        Returns:
+            List of tuples containing (text, seconds taken), one per word list,
+            in the order of custom_words_list
+        """
+        print(f"🔍 Extracting text with {len(custom_words_list)} custom word lists...")
+        
+        prepared = pil_to_cgimage(image)
+        local = threading.local()
+        
+        def run(custom_words: List[str]) -> Tuple[str, float]:
+            handler = getattr(local, 'handler', None)
+            if handler is None:
+                handler = local.handler = VNImageRequestHandler.alloc().initWithCGImage_options_(prepared, None)
+            request = self._request_with_words(custom_words)
+            start_time = time.perf_counter_ns()
+            try:
+                success = handler.performRequests_error_([request], None)
+                text = self._collect_text(request) if success else ""
+            except Exception as e:
+                print(f"❌ Apple Vision OCR error: {e}")
+                text = ""
+            return text, (time.perf_counter_ns() - start_time) / 1e9
+        
+        if workers > 1 and len(custom_words_list) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(run, custom_words_list))
+        else:
+            results = [run(custom_words) for custom_words in custom_words_list]
+        
+        print(f"✅ Apple Vision OCR ran {len(results)} word lists")
+        return results
+    
     def extract_text_with_confidence(self, image: Image.Image) -> List[Tuple[str, float]]:
         """
         Extract text with confidence scores using Apple Vision.
@@ -190,22 +395,7 @@ class AppleVisionOCREngine:
         print("🔍 Extracting text with confidence using Apple Vision OCR...")
         
         try:
-            # Convert PIL image to temporary file
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp_file:
-                image.save(temp_file.name, 'PNG')
-                temp_path = temp_file.name
-            
-            # Create NSURL from file path
-            file_url = NSURL.fileURLWithPath_(temp_path)
-            
-            # Create image request handler
-            request_handler = VNImageRequestHandler.alloc().initWithURL_options_(file_url, None)
-            
-            # Perform text recognition
-            error = None
-            success = request_handler.performRequests_error_([self.text_request], error)
-            
-            if not success:
+            if not self._perform_request(image):
                 print("❌ Apple Vision OCR failed")
                 return []
             
@@ -227,9 +417,6 @@ class AppleVisionOCREngine:
                             confidence = candidate.confidence()
                             results.append((text, float(confidence)))
             
-            # Clean up temporary file
-            os.unlink(temp_path)
-            
             print(f"✅ Apple Vision OCR extracted {len(results)} text regions")
             return results
             
@@ -244,7 +431,12 @@ class AppleVisionOCREngine:
         Args:
             custom_words: List of custom words to improve recognition accuracy
         """
-        self.custom_words = custom_words
+        # Same vocabulary is already set on the request. Compared by value, not
+        # identity: a list edited in place and passed again must be reapplied
+        if tuple(custom_words or ()) == self._words_tuple:
+            return
+        
+        self._set_words(custom_words)
         if self.custom_words:
             try:
                 from Foundation import NSArray
@@ -272,4 +464,30 @@ class AppleVisionOCREngine:
             test_request = VNRecognizeTextRequest.alloc().init()
             return test_request is not None
         except Exception:
-            return False
\ No newline at end of file
+            return False
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_engine(language: str, words_key: Tuple[str, ...]) -> AppleVisionOCREngine:
+    """Build and prewarm an engine for get_engine()."""
+    engine = AppleVisionOCREngine(language=language, custom_words=list(words_key))
+    engine.prewarm()
+    return engine
+
+
+def get_engine(custom_words: List[str] = None, language: str = "en") -> AppleVisionOCREngine:
+    """
+    Get a shared, prewarmed engine for a vocabulary.
+    
+    Engines are cached per (language, custom words), so callers asking for
+    the same vocabulary get the same instance. Don't call
+    update_custom_words() on a shared engine; ask for another one instead.
+    
+    Args:
+        custom_words: List of custom words to improve recognition accuracy
+        language: Language code for OCR
+        
+    Returns:
+        AppleVisionOCREngine instance
+    """
+    return _cached_engine(language, tuple(custom_words or ()))
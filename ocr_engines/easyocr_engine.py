@@ -117,14 +117,14 @@ class EasyOCREngine:
         Extract text from PIL Image using EasyOCR.
         
         Args:
-            image: PIL Image object
+            image: PIL Image object, or its pixels as a numpy array
             
         Returns:
             Extracted text as string
         """
         try:
-            # Convert PIL Image to numpy array
-            img_array = np.array(image)
+            # Convert PIL Image to numpy array (arrays are used as-is)
+            img_array = np.asarray(image)
             
             # Extract text with bounding boxes using custom parameters
             results = self.reader.readtext(
@@ -134,17 +134,67 @@ class EasyOCREngine:
                 link_threshold=self.link_threshold
             )
             
-            # Combine all text
-            text_parts = []
-            for (bbox, text, confidence) in results:
-                if confidence > 0.5:  # Filter low confidence results
-                    text_parts.append(text)
+            return self._join_results(results)
+            
+        except Exception as e:
+            raise RuntimeError(f"EasyOCR failed: {str(e)}") from e
+    
+    def extract_text_batch(self, images: List[Image.Image], batch_size: int = 8) -> List[str]:
+        """
+        Extract text from several images with batched EasyOCR inference.
+        
+        Images of the same size go through the detector together, at most
+        batch_size at a time; images are never resized to a common size, so
+        results match extract_text().
+        
+        Args:
+            images: PIL Image objects, or their pixels as numpy arrays
+            batch_size: Most images stacked into one detector pass, and text
+                regions recognized per batch
+            
+        Returns:
+            Extracted text for each image, in order
+        """
+        try:
+            img_arrays = [np.asarray(image) for image in images]
+            
+            # readtext_batched() stacks the detector inputs, so group by shape
+            indices_by_shape = {}
+            for index, img_array in enumerate(img_arrays):
+                indices_by_shape.setdefault(img_array.shape, []).append(index)
             
-            return '\n'.join(text_parts)
+            # Chunk each group so one detector pass never stacks more than
+            # batch_size full-resolution images into GPU/CPU memory
+            chunks = [indices[start:start + batch_size]
+                      for indices in indices_by_shape.values()
+                      for start in range(0, len(indices), batch_size)]
+            
+            texts = [''] * len(img_arrays)
+            for indices in chunks:
+                batch_results = self.reader.readtext_batched(
+                    [img_arrays[index] for index in indices],
+                    batch_size=batch_size,
+                    text_threshold=self.text_threshold,
+                    low_text=self.low_text,
+                    link_threshold=self.link_threshold
+                )
+                for index, results in zip(indices, batch_results):
+                    texts[index] = self._join_results(results)
+            
+            return texts
             
         except Exception as e:
             raise RuntimeError(f"EasyOCR failed: {str(e)}") from e
     
+    def _join_results(self, results: List[Tuple]) -> str:
+        """Combine readtext() results into text, dropping low-confidence lines."""
+        text_parts = []
+        for (bbox, text, confidence) in results:
+            if confidence > 0.5:  # Filter low confidence results
+                text_parts.append(text)
+        
+        return '\n'.join(text_parts)
+    
     def extract_text_with_confidence(self, image: Image.Image) -> List[Tuple[str, float]]:
         """
         Extract text with confidence scores.
@@ -156,7 +206,7 @@ class EasyOCREngine:
             List of tuples (text, confidence)
         """
         try:
-            img_array = np.array(image)
+            img_array = np.asarray(image)
             results = self.reader.readtext(
                 img_array,
                 text_threshold=self.text_threshold,
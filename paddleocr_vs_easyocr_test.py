@@ -56,16 +56,8 @@ def test_ocr_engine(engine_name, image_path, ground_truth_path, language="en", p
         
         # Apply additional preprocessing if requested
         if preprocessing:
-            from utils.image_utils import preprocess_image_for_ocr
-            import tempfile
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp_file:
-                temp_path = tmp_file.name
-            image.save(temp_path)
-            preprocessed_path = preprocess_image_for_ocr(temp_path, os.path.dirname(temp_path), False)
-            image = Image.open(preprocessed_path)
-            os.unlink(temp_path)
-            if preprocessed_path != temp_path:
-                os.unlink(preprocessed_path)
+            from utils.image_utils import preprocess_image_for_ocr_pil
+            image = preprocess_image_for_ocr_pil(image)
         
         # Extract text
         extracted_text = heic2txt.ocr.extract_text(image)
@@ -6,7 +6,7 @@ Simple test script to demonstrate custom words improvement with Apple Vision OCR
 import os
 import time
 from PIL import Image
-from utils.text_utils import calculate_text_similarity
+from utils.text_utils import calculate_text_similarity, find_words_in_tokens
 from ocr_engines.apple_vision_ocr import AppleVisionOCREngine
 
 def test_custom_words():
@@ -120,10 +120,8 @@ def test_custom_words():
     print()
     
     # Check for technical terms
-    technical_terms_found = []
-    for term in custom_words[:20]:
-        if term.lower() in text_enhanced.lower():
-            technical_terms_found.append(term)
+    terms = custom_words[:20]
+    technical_terms_found = find_words_in_tokens(terms, [word.lower() for word in terms], text_enhanced)
     
     print(f"🎯 Technical terms detected: {len(technical_terms_found)}")
     if technical_terms_found:
@@ -9,7 +9,7 @@ to find the optimal configuration for infrastructure and automation content.
 import os
 import time
 from PIL import Image
-from utils.text_utils import calculate_text_similarity
+from utils.text_utils import calculate_text_similarity, find_words_in_tokens
 from ocr_engines.apple_vision_ocr import AppleVisionOCREngine
 from domain_specific_custom_words import (
     get_terraform_custom_words,
@@ -66,11 +66,7 @@ def test_terraform_ansible_combinations(image_path: str):
         processing_time = time.time() - start_time
         
         # Count custom words found
-        words_found = []
-        if custom_words:
-            for word in custom_words:
-                if word.lower() in text.lower():
-                    words_found.append(word)
+        words_found = find_words_in_tokens(custom_words, [word.lower() for word in custom_words], text)
         
         result = {
             'test_name': test_name,
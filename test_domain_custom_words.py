@@ -10,6 +10,7 @@ import os
 import time
 from PIL import Image
 from ocr_engines.apple_vision_ocr import AppleVisionOCREngine
+from utils.text_utils import find_words_in_tokens
 from domain_specific_custom_words import (
     get_terraform_custom_words,
     get_ansible_custom_words, 
@@ -62,11 +63,7 @@ def test_domain_custom_words(image_path: str):
         processing_time = time.time() - start_time
         
         # Count custom words found
-        words_found = []
-        if custom_words:
-            for word in custom_words:
-                if word.lower() in text.lower():
-                    words_found.append(word)
+        words_found = find_words_in_tokens(custom_words, [word.lower() for word in custom_words], text)
         
         result = {
             'test_name': test_name,
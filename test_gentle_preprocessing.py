@@ -27,14 +27,11 @@ def calculate_similarity(text1, text2):
 def gentle_preprocess_image(image_path):
     """Apply gentler preprocessing"""
     try:
-        # Load image
-        img = cv2.imread(image_path)
-        if img is None:
+        # Load image straight to grayscale
+        gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        if gray is None:
             raise ValueError("Could not load image")
         
-        # Convert to grayscale
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        
         # Apply adaptive thresholding instead of global thresholding
         adaptive_thresh = cv2.adaptiveThreshold(
             gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
@@ -51,14 +48,11 @@ def gentle_preprocess_image(image_path):
 def aggressive_preprocess_image(image_path):
     """Apply aggressive preprocessing (original method)"""
     try:
-        # Load image
-        img = cv2.imread(image_path)
-        if img is None:
+        # Load image straight to grayscale
+        gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        if gray is None:
             raise ValueError("Could not load image")
         
-        # Convert to grayscale
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        
         # Invert colors (white -> black, blue -> white)
         inverted = cv2.bitwise_not(gray)
         
@@ -29,14 +29,11 @@ def calculate_similarity(text1, text2):
 def preprocess_image_for_ocr(image_path):
     """Apply preprocessing: invert colors, thresholding, noise cleaning"""
     try:
-        # Load image
-        img = cv2.imread(image_path)
-        if img is None:
+        # Load image straight to grayscale
+        gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        if gray is None:
             raise ValueError("Could not load image")
         
-        # Convert to grayscale
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        
         # Invert colors (white -> black, blue -> white)
         inverted = cv2.bitwise_not(gray)
         
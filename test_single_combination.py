@@ -53,7 +53,7 @@ def test_single_combination():
         
         try:
             from ocr_engines.apple_vision_ocr import AppleVisionOCREngine
-            from utils.text_utils import save_text_to_file
+            from utils.text_utils import find_words_in_tokens, save_text_to_file
             from PIL import Image
             import subprocess
             
@@ -67,10 +67,9 @@ def test_single_combination():
                 results.append({"success": False, "error": "HEIC conversion failed"})
                 continue
             
-            # Use the original working preprocessing
-            from utils.image_utils import preprocess_image_for_ocr
-            preprocessed_path = preprocess_image_for_ocr(png_path, "/tmp", save_images=True)
-            preprocessed_image = Image.open(preprocessed_path)
+            # Use the original working preprocessing, in memory
+            from utils.image_utils import preprocess_image_for_ocr_pil
+            preprocessed_image = preprocess_image_for_ocr_pil(Image.open(png_path))
             
             # Initialize OCR with custom words
             ocr = AppleVisionOCREngine(language="en", custom_words=custom_words)
@@ -124,10 +123,7 @@ def test_single_combination():
                 continue
             
             # Count custom words found
-            words_found = []
-            for word in custom_words:
-                if word.lower() in final_text.lower():
-                    words_found.append(word)
+            words_found = find_words_in_tokens(custom_words, [word.lower() for word in custom_words], final_text)
             
             print(f"✅ Success: {len(final_text)} chars, {len(words_found)} custom words found")
             print(f"📝 Found: {', '.join(words_found[:5])}")
@@ -145,8 +141,7 @@ def test_single_combination():
             # Clean up
             try:
                 os.unlink(png_path)
-                os.unlink(preprocessed_path)
-            except:
+            except OSError:
                 pass
             
         except Exception as e:
@@ -10,6 +10,7 @@ import os
 import time
 import subprocess
 from pathlib import Path
+from utils.text_utils import find_words_in_tokens
 from domain_specific_custom_words import get_domain_specific_words
 
 def get_top5_combinations():
@@ -111,10 +112,7 @@ def run_batch_processing(combination, input_dir, output_dir):
                 print(f"   Preview: {sample_text[:100]}...")
                 
                 # Count custom words found in sample
-                words_found = []
-                for word in custom_words:
-                    if word.lower() in sample_text.lower():
-                        words_found.append(word)
+                words_found = find_words_in_tokens(custom_words, [word.lower() for word in custom_words], sample_text)
                 
                 print(f"🎯 Custom words found in sample: {len(words_found)}/{len(custom_words)}")
                 if words_found:
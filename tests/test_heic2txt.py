@@ -3,17 +3,28 @@
 import pytest
 import tempfile
 import os
+import re
 from pathlib import Path
 from unittest.mock import Mock, patch
 
-from heic2txt import HEIC2TXT
-from utils.image_utils import is_heic_file
-from utils.text_utils import preprocess_text, save_text_to_file
+import domain_specific_custom_words
+from click.testing import CliRunner
+
+from heic2txt import HEIC2TXT, _build_engine, main
+from utils.image_utils import is_heic_file, preprocess_image_for_ocr_array, preprocess_image_for_ocr_pil
+from utils.text_utils import (calculate_similarity_to_normalized, calculate_text_similarity,
+                              calculate_tokenized_similarity, cer, find_words_in_tokens,
+                              normalize_text_for_comparison, preprocess_text,
+                              save_text_to_file, tokenize_text, wer)
 
 
 class TestHEIC2TXT:
     """Test cases for HEIC2TXT class."""
     
+    def setup_method(self):
+        """Start each test without engines cached by earlier tests."""
+        _build_engine.cache_clear()
+    
     def test_init_tesseract(self):
         """Test initialization with Tesseract engine."""
         with patch('ocr_engines.tesseract_ocr.TesseractOCR'):
@@ -66,6 +77,119 @@ class TestHEIC2TXT:
         result = converter.convert_file("test.jpg")
         
         assert result is False
+    
+    @patch('heic2txt.TesseractOCR')
+    def test_converters_share_engine(self, mock_tesseract):
+        """Test converters with the same settings share one engine instance."""
+        mock_tesseract.side_effect = lambda **kwargs: Mock()
+        first = HEIC2TXT(engine="tesseract", language="eng")
+        second = HEIC2TXT(engine="tesseract", language="eng", preprocess=True)
+        other_language = HEIC2TXT(engine="tesseract", language="deu")
+        
+        assert first.ocr is second.ocr
+        assert first.ocr is not other_language.ocr
+        assert mock_tesseract.call_count == 2
+    
+    @patch('heic2txt._build_engine')
+    def test_convert_batch_runs_every_file(self, mock_build, tmp_path, capsys):
+        """Test batch conversion on a thread pool converts each file once."""
+        for name in ("a.heic", "b.heic", "c.heic"):
+            (tmp_path / name).touch()
+        
+        def fake_convert(input_path, output_path):
+            return Path(input_path).stem != "b"
+        
+        converter = HEIC2TXT(engine="tesseract", workers=2)
+        with patch.object(converter, 'convert_file', side_effect=fake_convert) as mock_convert:
+            converter.convert_batch(str(tmp_path), str(tmp_path / "out"))
+        
+        converted = sorted(Path(call.args[0]).name for call in mock_convert.call_args_list)
+        assert converted == ["a.heic", "b.heic", "c.heic"]
+        assert "Successfully converted 2/3 files" in capsys.readouterr().out
+    
+    @staticmethod
+    def _fake_engine(text_threshold=0.7):
+        """Engine stand-in with one scalar setting and a mocked extract_text()."""
+        engine = type("FakeEngine", (), {})()
+        engine.text_threshold = text_threshold
+        engine.extract_text = Mock(return_value="Sample text")
+        return engine
+    
+    @patch('heic2txt.convert_heic_to_pil')
+    @patch('heic2txt._build_engine')
+    def test_convert_file_cache_miss_then_hit(self, mock_build, mock_convert, tmp_path):
+        """Test an opted-in cache runs OCR on the first call and reuses it after."""
+        engine = self._fake_engine()
+        mock_build.return_value = engine
+        heic_file = tmp_path / "image.heic"
+        heic_file.write_bytes(b"heic bytes")
+        
+        converter = HEIC2TXT(use_cache=True, cache_path=str(tmp_path / "cache" / "ocr"))
+        assert converter.convert_file(str(heic_file), str(tmp_path / "first.txt"))
+        assert converter.convert_file(str(heic_file), str(tmp_path / "second.txt"))
+        
+        assert engine.extract_text.call_count == 1
+        assert (tmp_path / "second.txt").read_text(encoding='utf-8').strip() == "Sample text"
+    
+    @patch('heic2txt.convert_heic_to_pil')
+    @patch('heic2txt._build_engine')
+    def test_convert_file_cache_misses_on_new_settings(self, mock_build, mock_convert, tmp_path):
+        """Test results cached under other engine settings are not reused."""
+        heic_file = tmp_path / "image.heic"
+        heic_file.write_bytes(b"heic bytes")
+        cache_path = str(tmp_path / "ocr")
+        
+        for text_threshold in (0.7, 0.5):
+            engine = self._fake_engine(text_threshold)
+            mock_build.return_value = engine
+            converter = HEIC2TXT(use_cache=True, cache_path=cache_path)
+            converter.convert_file(str(heic_file), str(tmp_path / "out.txt"))
+            assert engine.extract_text.call_count == 1
+    
+    @patch('heic2txt.convert_heic_to_pil')
+    @patch('heic2txt._build_engine')
+    def test_convert_file_cache_off_by_default(self, mock_build, mock_convert, tmp_path):
+        """Test OCR runs every time and nothing is written without use_cache."""
+        engine = self._fake_engine()
+        mock_build.return_value = engine
+        heic_file = tmp_path / "image.heic"
+        heic_file.write_bytes(b"heic bytes")
+        
+        converter = HEIC2TXT(cache_path=str(tmp_path / "cache" / "ocr"))
+        converter.convert_file(str(heic_file), str(tmp_path / "first.txt"))
+        converter.convert_file(str(heic_file), str(tmp_path / "second.txt"))
+        
+        assert engine.extract_text.call_count == 2
+        assert not (tmp_path / "cache").exists()
+    
+    @patch('heic2txt.convert_heic_to_pil')
+    @patch('heic2txt._build_engine')
+    def test_convert_file_does_not_cache_empty_text(self, mock_build, mock_convert, tmp_path):
+        """Test an OCR run that found no text is retried rather than cached."""
+        engine = self._fake_engine()
+        engine.extract_text.return_value = ""
+        mock_build.return_value = engine
+        heic_file = tmp_path / "image.heic"
+        heic_file.write_bytes(b"heic bytes")
+        
+        converter = HEIC2TXT(use_cache=True, cache_path=str(tmp_path / "ocr"))
+        assert not converter.convert_file(str(heic_file), str(tmp_path / "first.txt"))
+        assert not converter.convert_file(str(heic_file), str(tmp_path / "second.txt"))
+        
+        assert engine.extract_text.call_count == 2
+    
+    @pytest.mark.parametrize("flags, use_cache", [([], False), (["--no-cache"], False), (["--cache"], True)])
+    def test_cli_cache_flags(self, flags, use_cache, tmp_path):
+        """Test the CLI only enables the OCR cache with --cache."""
+        heic_file = tmp_path / "image.heic"
+        heic_file.touch()
+        
+        with patch('heic2txt.HEIC2TXT') as mock_converter:
+            result = CliRunner().invoke(main, [str(heic_file), "--cache-file", str(tmp_path / "ocr")] + flags)
+        
+        assert result.exit_code == 0, result.output
+        assert mock_converter.call_args.kwargs['use_cache'] is use_cache
+        assert mock_converter.call_args.kwargs['cache_path'] == str(tmp_path / "ocr")
 
 
 class TestImageUtils:
@@ -94,6 +218,23 @@ class TestImageUtils:
     def test_is_heic_file_nonexistent(self):
         """Test HEIC file detection with nonexistent file."""
         assert is_heic_file("nonexistent.heic") is False
+    
+    def test_preprocess_image_for_ocr_pil(self):
+        """Test in-memory preprocessing keeps the size and binarizes."""
+        from PIL import Image
+        image = Image.new('RGB', (64, 32), 'white')
+        result = preprocess_image_for_ocr_pil(image)
+        assert result.mode == 'L'
+        assert result.size == image.size
+        assert set(result.getdata()) <= {0, 255}
+    
+    def test_preprocess_image_for_ocr_array_color(self):
+        """Test array preprocessing converts RGB pixels to a 2D binary image."""
+        import numpy as np
+        image = np.full((32, 64, 3), 255, dtype=np.uint8)
+        result = preprocess_image_for_ocr_array(image)
+        assert result.shape == (32, 64)
+        assert set(np.unique(result)) <= {0, 255}
 
 
 class TestTextUtils:
@@ -111,6 +252,37 @@ class TestTextUtils:
         assert preprocess_text("") == ""
         assert preprocess_text(None) is None
     
+    def test_similarity_to_normalized_matches_full_similarity(self):
+        """Test that a pre-normalized reference gives the same score."""
+        reference = "  Hello   World\nfrom OCR "
+        text = "hello world from 0CR"
+        reference_norm = normalize_text_for_comparison(reference)
+        assert calculate_similarity_to_normalized(reference_norm, text) == \
+            calculate_text_similarity(reference, text)
+    
+    def test_tokenized_similarity_matches_full_similarity(self):
+        """Test that similarity on tokenized texts gives the same score."""
+        text1 = "  Hello   World\nfrom OCR "
+        text2 = "hello world from 0CR"
+        assert calculate_tokenized_similarity(tokenize_text(text1), tokenize_text(text2)) == \
+            calculate_text_similarity(text1, text2)
+        assert calculate_tokenized_similarity(tokenize_text(""), tokenize_text(text2)) == 0.0
+    
+    def test_error_rates(self):
+        """Test character and word error rates."""
+        assert cer("kitten", "sitting") == pytest.approx(0.5)
+        assert wer("the quick brown fox", "the quick fox") == pytest.approx(0.25)
+        assert cer("same", "same") == 0.0
+        assert wer("", "") == 0.0
+    
+    def test_find_words_in_tokens(self):
+        """Test token-set scanning, including entries spanning several tokens."""
+        words = ["Terraform", "s3", "tfstate.backup", "vpc"]
+        text = "terraform wrote prod.tfstate.backup to S3; s3cret"
+        assert find_words_in_tokens(words, [w.lower() for w in words], text) == \
+            ["Terraform", "s3", "tfstate.backup"]
+        assert find_words_in_tokens([], [], "any text") == []
+    
     def test_save_text_to_file(self):
         """Test saving text to file."""
         with tempfile.TemporaryDirectory() as tmp_dir:
@@ -120,5 +292,17 @@ class TestTextUtils:
             result = save_text_to_file(text, output_path)
 
 
+class TestDomainCustomWords:
+    """Test cases for the domain-specific custom word lists."""
+    
+    @pytest.mark.parametrize("domain", ["terraform", "ansible", "aws", "postgresql", "mysql"])
+    def test_domain_words_have_no_duplicates(self, domain):
+        """Test that each domain list is duplicate-free at the source."""
+        words = getattr(domain_specific_custom_words, f"get_{domain}_custom_words")()
+        assert len(words) == len(set(words))
+        # Operator symbols live in the separate get_*_operators() lists
+        assert all(re.search(r"\w", word) for word in words)
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,111 @@
+"""Custom word lists for Apple Vision OCR.
+
+Each list is a module-level tuple, so it is built once.
+"""
+
+from typing import Tuple
+
+TERRAFORM_WORDS: Tuple[str, ...] = (
+    # Terraform core terms
+    "terraform", "provider", "resource", "variable", "output", "module",
+    "data", "locals", "for_each", "count", "depends_on", "lifecycle",
+    "backend", "state", "workspace", "environment", "configuration",
+
+    # AWS services and resources
+    "aws", "ec2", "s3", "rds", "lambda", "apigateway", "cloudfront",
+    "cloudwatch", "iam", "kms", "secrets", "ssm", "parameter", "store",
+    "vpc", "subnet", "security_group", "route_table", "internet_gateway",
+    "nat_gateway", "load_balancer", "autoscaling", "elasticache",
+    "redshift", "dynamodb", "sqs", "sns", "eventbridge", "stepfunctions",
+    "ecs", "eks", "fargate", "ecr", "codebuild", "codepipeline",
+    "codedeploy", "cloudformation", "systems_manager", "config",
+
+    # File extensions and formats
+    "tf", "tfvars", "tfstate", "hcl", "json", "yaml", "yml", "toml",
+
+    # Common technical terms
+    "infrastructure", "deployment", "production", "staging", "development",
+    "testing", "monitoring", "logging", "metrics", "alerting", "backup",
+    "recovery", "disaster", "scalability", "availability", "reliability",
+    "performance", "security", "compliance", "governance", "policy", "access",
+    "authentication", "authorization", "encryption", "decryption",
+    "network", "firewall", "bastion", "nat", "vpn", "directconnect",
+)
+
+PROGRAMMING_WORDS: Tuple[str, ...] = (
+    # Programming languages
+    "python", "javascript", "typescript", "java", "go", "rust", "swift",
+    "kotlin", "php", "ruby", "cpp", "csharp", "scala", "clojure",
+
+    # Frameworks and libraries
+    "react", "vue", "angular", "nodejs", "express", "django", "flask",
+    "spring", "hibernate", "jpa", "jdbc", "mybatis", "struts",
+    "laravel", "symfony", "codeigniter", "cakephp", "zend",
+    "rails", "sinatra", "hanami", "grape", "padrino",
+    "tornado", "fastapi", "bottle", "cherrypy", "pyramid",
+
+    # Common programming terms
+    "function", "method", "class", "object", "array", "string", "integer",
+    "boolean", "null", "undefined", "exception", "error", "warning",
+    "debug", "trace", "log", "console", "print", "return", "import",
+    "export", "require", "include", "namespace", "package", "library",
+    "framework", "api", "rest", "graphql", "soap", "grpc", "websocket",
+    "http", "https", "tcp", "udp", "ip", "dns", "ssl", "tls",
+)
+
+MEDICAL_WORDS: Tuple[str, ...] = (
+    # Medical terms
+    "patient", "diagnosis", "treatment", "therapy", "medication", "dosage",
+    "prescription", "symptoms", "condition", "disease", "disorder",
+    "syndrome", "infection", "inflammation", "tumor", "cancer", "benign",
+    "malignant", "metastasis", "remission", "relapse", "prognosis",
+
+    # Body systems
+    "cardiovascular", "respiratory", "digestive", "nervous", "muscular",
+    "skeletal", "endocrine", "immune", "lymphatic", "urinary", "reproductive",
+
+    # Medical procedures
+    "surgery", "biopsy", "radiology", "mri", "ct", "xray", "ultrasound",
+    "endoscopy", "colonoscopy", "mammography", "echocardiogram",
+
+    # Medications
+    "antibiotic", "antiviral", "antifungal", "analgesic", "antipyretic",
+    "antihistamine", "anticoagulant", "diuretic", "beta", "blocker",
+    "ace", "inhibitor", "statin", "insulin", "cortisol", "adrenaline",
+)
+
+LEGAL_WORDS: Tuple[str, ...] = (
+    # Legal terms
+    "plaintiff", "defendant", "attorney", "counsel", "judge", "court",
+    "jury", "trial", "hearing", "motion", "objection", "sustained",
+    "overruled", "evidence", "testimony", "witness", "deposition",
+    "subpoena", "warrant", "indictment", "arraignment", "plea",
+    "guilty", "not", "nolo", "contendere", "verdict",
+    "sentence", "probation", "parole", "appeal", "conviction",
+
+    # Legal documents
+    "contract", "agreement", "lease", "deed", "will", "trust",
+    "power", "of", "affidavit", "petition", "complaint",
+    "answer", "counterclaim", "cross", "claim", "third", "party",
+    "interrogatories", "requests", "for", "production", "admissions",
+)
+
+
+def get_terraform_custom_words() -> Tuple[str, ...]:
+    """Get custom words for Terraform/infrastructure content."""
+    return TERRAFORM_WORDS
+
+
+def get_programming_custom_words() -> Tuple[str, ...]:
+    """Get custom words for programming/code content."""
+    return PROGRAMMING_WORDS
+
+
+def get_medical_custom_words() -> Tuple[str, ...]:
+    """Get custom words for medical/healthcare content."""
+    return MEDICAL_WORDS
+
+
+def get_legal_custom_words() -> Tuple[str, ...]:
+    """Get custom words for legal content."""
+    return LEGAL_WORDS
@@ -32,12 +32,13 @@ def is_heic_file(file_path: str) -> bool:
     return True
 
 
-def convert_heic_to_pil(file_path: str) -> Optional[Image.Image]:
+def convert_heic_to_pil(file_path: str, max_size: Optional[int] = None) -> Optional[Image.Image]:
     """
     Convert HEIC file to PIL Image.
     
     Args:
         file_path: Path to HEIC file
+        max_size: If given, shrink the image in place so no side exceeds it
         
     Returns:
         PIL Image object or None if conversion fails
@@ -56,6 +57,11 @@ def convert_heic_to_pil(file_path: str) -> Optional[Image.Image]:
             heif_file.stride,
         )
         
+        if max_size and max(image.size) > max_size:
+            # thumbnail() box-reduces by an integer factor before resampling,
+            # which is much cheaper than a full-size LANCZOS resize
+            image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+        
         return image
         
     except Exception as e:
@@ -119,6 +125,69 @@ def get_image_info(file_path: str) -> Optional[dict]:
         return None
 
 
+def _binarize_for_ocr(gray: np.ndarray) -> np.ndarray:
+    """
+    Threshold a grayscale image to dark text on a light background.
+    
+    Args:
+        gray: Grayscale image as a 2D uint8 array
+        
+    Returns:
+        Binarized image as a 2D uint8 array
+    """
+    # Apply Gaussian blur to reduce noise
+    blurred = cv2.GaussianBlur(gray, (3, 3), 0)
+    
+    # Apply adaptive thresholding
+    thresh = cv2.adaptiveThreshold(
+        blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
+    )
+    
+    # Apply morphological operations to clean up the image
+    kernel = np.ones((1, 1), np.uint8)
+    cleaned = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
+    
+    # Invert colors if needed (white text on black background)
+    # This helps with OCR engines that expect dark text on light background
+    if np.mean(cleaned) < 127:  # If image is mostly dark
+        cleaned = cv2.bitwise_not(cleaned)
+    
+    return cleaned
+
+
+def preprocess_image_for_ocr_array(image: np.ndarray) -> np.ndarray:
+    """
+    Preprocess already-decoded pixels for better OCR results.
+    
+    Same processing as preprocess_image_for_ocr(), without reading or
+    writing any files.
+    
+    Args:
+        image: Grayscale (2D), RGB or RGBA image as a uint8 numpy array
+        
+    Returns:
+        Preprocessed image as a 2D uint8 array
+    """
+    if image.ndim == 3:
+        code = cv2.COLOR_RGBA2GRAY if image.shape[2] == 4 else cv2.COLOR_RGB2GRAY
+        image = cv2.cvtColor(image, code)
+    return _binarize_for_ocr(image)
+
+
+def preprocess_image_for_ocr_pil(image: Image.Image) -> Image.Image:
+    """
+    Preprocess an in-memory image for better OCR results.
+    
+    Args:
+        image: PIL Image object
+        
+    Returns:
+        Preprocessed grayscale PIL Image
+    """
+    gray = np.asarray(image.convert('L'))
+    return Image.fromarray(preprocess_image_for_ocr_array(gray))
+
+
 def preprocess_image_for_ocr(image_path: str, output_dir: str, save_images: bool = False) -> str:
     """
     Preprocess image for better OCR results.
@@ -132,30 +201,12 @@ def preprocess_image_for_ocr(image_path: str, output_dir: str, save_images: bool
         Path to preprocessed image
     """
     try:
-        # Load image
-        image = cv2.imread(image_path)
-        if image is None:
+        # Load image straight to grayscale
+        gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        if gray is None:
             return image_path
         
-        # Convert to grayscale
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        
-        # Apply Gaussian blur to reduce noise
-        blurred = cv2.GaussianBlur(gray, (3, 3), 0)
-        
-        # Apply adaptive thresholding
-        thresh = cv2.adaptiveThreshold(
-            blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
-        )
-        
-        # Apply morphological operations to clean up the image
-        kernel = np.ones((1, 1), np.uint8)
-        cleaned = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
-        
-        # Invert colors if needed (white text on black background)
-        # This helps with OCR engines that expect dark text on light background
-        if np.mean(cleaned) < 127:  # If image is mostly dark
-            cleaned = cv2.bitwise_not(cleaned)
+        cleaned = _binarize_for_ocr(gray)
         
         # Save preprocessed image if requested
         if save_images:
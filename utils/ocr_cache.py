@@ -0,0 +1,137 @@
+"""On-disk cache of OCR results shared by the comparison scripts.
+
+Results are stored as (text, seconds taken[, time stored]) in a shelve file,
+keyed by the engine, its language and settings, the image pixels (or file
+bytes) and the custom word list.
+"""
+
+import contextlib
+import hashlib
+import os
+import shelve
+from typing import Iterable, Iterator
+
+from PIL import Image
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+OCR_CACHE_FILE = os.path.expanduser("~/.heic2txt_ocr_cache")
+
+# Entries kept by evict_oldest()
+OCR_CACHE_MAX_ENTRIES = 10000
+
+
+def image_key(image: Image.Image) -> str:
+    """
+    Stable cache key for an image's pixels.
+    
+    Args:
+        image: PIL Image object
+    
+    Returns:
+        Hex digest of the image mode, size and pixel bytes
+    """
+    digest = hashlib.blake2b(f"{image.mode}:{image.size}".encode('utf-8'), digest_size=16)
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def file_key(file_path: str) -> str:
+    """
+    Stable cache key for a file's contents.
+    
+    Args:
+        file_path: Path to the file
+    
+    Returns:
+        Hex digest of the file bytes
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def words_key(custom_words: Iterable[str]) -> str:
+    """Stable cache key for a custom word list (hash() of str varies between runs)."""
+    joined = "\n".join(sorted(set(custom_words)))
+    return hashlib.blake2b(joined.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def ocr_cache_key(engine_name: str, language: str, image_digest: str,
+                  custom_words: Iterable[str], settings: str = "") -> str:
+    """
+    Cache key for one OCR run.
+    
+    Args:
+        engine_name: Name of the OCR engine (e.g. 'apple_vision')
+        language: Language the engine was configured with
+        image_digest: image_key() of the image OCR'd
+        custom_words: Custom words the engine was configured with
+        settings: Any other engine configuration (class, version, thresholds)
+            that changes its output
+    
+    Returns:
+        Key for open_ocr_cache()
+    """
+    key = f"{engine_name}:{language}:{image_digest}:{words_key(custom_words)}"
+    if settings:
+        key += ":" + hashlib.blake2b(settings.encode('utf-8'), digest_size=16).hexdigest()
+    return key
+
+
+@contextlib.contextmanager
+def open_ocr_cache(path: str = OCR_CACHE_FILE) -> Iterator[shelve.Shelf]:
+    """
+    Open an OCR result cache, holding an exclusive lock on it while open.
+    
+    The lock is a flock() on a sibling .lock file, so concurrent processes
+    (e.g. two CLI runs) take turns instead of corrupting the dbm file. Where
+    fcntl is unavailable (Windows) the shelf is opened without a lock.
+    
+    Args:
+        path: Cache file path (default: OCR_CACHE_FILE)
+    
+    Yields:
+        The open shelf
+    """
+    cache_dir = os.path.dirname(path)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    if fcntl is None:
+        with shelve.open(path) as cache:
+            yield cache
+        return
+    
+    with open(f"{path}.lock", 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            with shelve.open(path) as cache:
+                yield cache
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def evict_oldest(cache: shelve.Shelf, max_entries: int = OCR_CACHE_MAX_ENTRIES) -> None:
+    """
+    Drop the oldest entries once the cache holds more than max_entries.
+    
+    Entries are ordered by the time stored as their third element; entries
+    without one count as oldest. The cache is trimmed to 90% of max_entries,
+    so it is not scanned again on every insert.
+    
+    Args:
+        cache: Open shelf from open_ocr_cache()
+        max_entries: Most entries to keep
+    """
+    if len(cache) <= max_entries:
+        return
+    
+    stored_at = {key: (value[2] if len(value) > 2 else 0.0) for key, value in cache.items()}
+    for key in sorted(stored_at, key=stored_at.get)[:len(stored_at) - int(max_entries * 0.9)]:
+        del cache[key]
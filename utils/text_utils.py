@@ -1,9 +1,23 @@
 """Text utility functions for HEIC2TXT."""
 
-import difflib
+import os
 import re
 from pathlib import Path
-from typing import Optional
+from typing import FrozenSet, List, NamedTuple, Sequence, Union
+
+from rapidfuzz import fuzz
+from rapidfuzz.distance import Levenshtein
+
+# A run of letters, digits and underscores
+_WORD_TOKEN = re.compile(r'\w+')
+
+
+class TokenizedText(NamedTuple):
+    """A text together with the lowercased, normalized and tokenized forms the analyses use."""
+    text: str
+    lower: str
+    normalized: str
+    tokens: FrozenSet[str]
 
 
 def preprocess_text(text: str) -> str:
@@ -87,9 +101,14 @@ def save_text_to_file(text: str, output_path: str) -> bool:
         # Create parent directories if they don't exist
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
-        # Write text to file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(text)
+        # Write text to file with one unbuffered write
+        data = memoryview(text.encode('utf-8'))
+        fd = os.open(output_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
         
         return True
         
@@ -177,16 +196,91 @@ def calculate_text_similarity(text1: str, text2: str) -> float:
     
     # Normalize texts for comparison
     text1_norm = normalize_text_for_comparison(text1)
-    text2_norm = normalize_text_for_comparison(text2)
     
-    if text1_norm == text2_norm:
+    return calculate_similarity_to_normalized(text1_norm, text2)
+
+
+def calculate_similarity_to_normalized(reference_norm: str, text: str) -> float:
+    """
+    Calculate similarity between an already-normalized reference and a text.
+    
+    Useful when the same reference (e.g. ground truth) is compared against
+    many texts, so it only has to be normalized once.
+    
+    Args:
+        reference_norm: Reference text already passed through normalize_text_for_comparison
+        text: Text to compare
+        
+    Returns:
+        Similarity score as percentage (0-100)
+    """
+    return _normalized_similarity(reference_norm, normalize_text_for_comparison(text))
+
+
+def calculate_tokenized_similarity(text1: TokenizedText, text2: TokenizedText) -> float:
+    """
+    Calculate similarity between two texts from tokenize_text().
+    
+    Gives the same score as calculate_text_similarity() on the raw texts,
+    reusing the normalized forms instead of recomputing them.
+    
+    Args:
+        text1: First tokenized text
+        text2: Second tokenized text
+        
+    Returns:
+        Similarity score as percentage (0-100)
+    """
+    if not text1.text and not text2.text:
         return 100.0
+    if not text1.text or not text2.text:
+        return 0.0
     
-    # Calculate similarity using difflib
-    similarity = difflib.SequenceMatcher(None, text1_norm, text2_norm).ratio()
+    return _normalized_similarity(text1.normalized, text2.normalized)
+
+
+def _normalized_similarity(reference_norm: str, text_norm: str) -> float:
+    """Similarity percentage between two already-normalized texts."""
+    if reference_norm == text_norm:
+        return 100.0
     
-    # Convert to percentage
-    return similarity * 100.0
+    # Already a percentage
+    return float(fuzz.ratio(reference_norm, text_norm))
+
+
+def _error_rate(reference: Sequence, hypothesis: Sequence) -> float:
+    """Edit distance normalized by the reference length."""
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+    return Levenshtein.distance(reference, hypothesis) / len(reference)
+
+
+def cer(reference: str, hypothesis: str) -> float:
+    """
+    Calculate the character error rate of an OCR result.
+    
+    Args:
+        reference: Ground truth text
+        hypothesis: OCR output
+        
+    Returns:
+        Character edits needed per reference character (0.0 is a perfect match)
+    """
+    return _error_rate(reference or "", hypothesis or "")
+
+
+def wer(reference: str, hypothesis: str) -> float:
+    """
+    Calculate the word error rate of an OCR result.
+    
+    Args:
+        reference: Ground truth text
+        hypothesis: OCR output
+        
+    Returns:
+        Word edits needed per reference word (0.0 is a perfect match)
+    """
+    return _error_rate((reference or "").split(), (hypothesis or "").split())
 
 
 def normalize_text_for_comparison(text: str) -> str:
@@ -212,3 +306,47 @@ def normalize_text_for_comparison(text: str) -> str:
     text = text.strip()
     
     return text
+
+
+def tokenize_text(text: str) -> TokenizedText:
+    """
+    Lowercase, normalize and tokenize a text once, for several analyses.
+    
+    Args:
+        text: Text to tokenize
+        
+    Returns:
+        TokenizedText for use with find_words_in_tokens() and
+        calculate_tokenized_similarity()
+    """
+    text = text or ""
+    lower = text.lower()
+    return TokenizedText(text, lower, re.sub(r'\s+', ' ', lower).strip(),
+                         frozenset(_WORD_TOKEN.findall(lower)))
+
+
+def find_words_in_tokens(words: Sequence[str], words_lower: Sequence[str],
+                         text: Union[str, TokenizedText]) -> List[str]:
+    """
+    Find which of the words occur in a text using a set of its tokens.
+    
+    Single-token words are set lookups; entries spanning several tokens
+    (e.g. "tfstate.backup") fall back to a substring check.
+    
+    Args:
+        words: Words to look for
+        words_lower: The same words lowercased (computed once by the caller)
+        text: Text to scan, or its tokenize_text() result
+        
+    Returns:
+        Words found in the text, in the order they appear in words
+    """
+    if not isinstance(text, TokenizedText):
+        text = tokenize_text(text)
+    if not text.text:
+        return []
+    
+    tokens = text.tokens
+    text_lower = text.lower
+    return [word for word, lower in zip(words, words_lower)
+            if lower in tokens or (_WORD_TOKEN.fullmatch(lower) is None and lower in text_lower)]